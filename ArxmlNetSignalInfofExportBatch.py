@@ -0,0 +1,266 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Export the signal info tables of many arxml files without the GUI.
+
+    python ArxmlNetSignalInfofExportBatch.py -o out extracts/ "ecus/**/*.arxml"
+
+Every input file is exported by its own worker process, as many files at once as the cpu count
+and the estimated memory of the files allow. A timing summary of every file is printed at the end.
+"""
+import argparse
+import functools
+import glob
+import multiprocessing
+import os
+import queue
+import sys
+import time
+
+import Function_NetSignalInfofExport
+
+logger = Function_NetSignalInfofExport.logger
+
+# estimated peak memory of exporting one file, measured about 12 times the arxml size plus the interpreter
+MEMORY_PER_JOB = 32 * 1024 * 1024
+MEMORY_PER_INPUT_BYTE = 15
+# seconds the result of a file may take to arrive after its worker process exited
+LOST_WORKER_GRACE = 5.0
+
+# queue of the (file, pid) of started exports in a worker process, see init_worker
+started_jobs = None
+
+
+def find_arxml_files(inputs):
+    """Expand the input arguments (files, directories, glob patterns) to the sorted list of arxml files."""
+    files = []
+    for pattern in inputs:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(pattern, "**", "*.arxml"), recursive=True)
+        elif glob.has_magic(pattern):
+            matches = glob.glob(pattern, recursive=True)
+        else:
+            matches = [pattern]
+        if not matches:
+            logger.warning("no arxml files found for %s", pattern)
+        files.extend(os.path.abspath(match) for match in matches if os.path.isfile(match))
+    return sorted(set(files))
+
+
+def available_memory():
+    """Free physical memory in bytes, None if it can not be determined on this platform."""
+    if sys.platform == "win32":
+        import ctypes
+
+        class MemoryStatus(ctypes.Structure):
+            _fields_ = [("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+                        ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                        ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                        ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                        ("ullAvailExtendedVirtual", ctypes.c_ulonglong)]
+
+        status = MemoryStatus()
+        status.dwLength = ctypes.sizeof(MemoryStatus)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return status.ullAvailPhys
+        return None
+    try:
+        with open("/proc/meminfo") as meminfo:
+            for line in meminfo:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (IOError, OSError, ValueError):
+        pass
+    return None
+
+
+def estimated_memory(path):
+    return MEMORY_PER_JOB + MEMORY_PER_INPUT_BYTE * os.path.getsize(path)
+
+
+def init_worker(started):
+    global started_jobs
+    started_jobs = started
+
+
+def new_stats(path, error=None):
+    return {"file": path, "size": os.path.getsize(path), "outputs": [], "error": error,
+            "channels": 0, "frames": 0, "signals": 0, "load": 0.0, "write": 0.0}
+
+
+def export_file(job):
+    """Export one arxml file in a worker process, return the statistics of the export.
+
+    Errors are returned in the statistics instead of raised, so the other files are still exported.
+    """
+    path, output_folder, per_channel, incremental, cache_dir = job
+    if started_jobs is not None:
+        started_jobs.put((path, os.getpid()))
+    stats = new_stats(path)
+    try:
+        start = time.time()
+        options = {"arxmlCacheDir": cache_dir} if cache_dir else {}
+        cluster, _ = Function_NetSignalInfofExport.arxml_file_load(path, **options)
+        stats["load"] = time.time() - start
+        stats["channels"] = len(cluster)
+        stats["frames"] = sum(len(db.frames) for db in cluster.values())
+        stats["signals"] = sum(len(frame.signals) for db in cluster.values() for frame in db.frames)
+        start = time.time()
+        stats["outputs"] = Function_NetSignalInfofExport.dump_signal_info(
+            cluster, os.path.basename(path), output_folder, per_channel=per_channel, incremental=incremental)
+        stats["write"] = time.time() - start
+    except Exception as error:
+        logger.exception("export of %s failed", path)
+        stats["error"] = "{}: {}".format(type(error).__name__, error)
+    return stats
+
+
+def export_failed(finished, path, error):
+    # error callback of the pool, the export raised outside of export_file or its result could not be sent
+    finished.put(new_stats(path, "{}: {}".format(type(error).__name__, error)))
+
+
+def find_lost_export(running, async_results, started, workers, exited):
+    """Return the statistics of a running export whose worker process is gone without a result, else None.
+
+    A worker is lost when the OS kills it, e.g. when it runs out of memory.
+    """
+    while not started.empty():
+        path, pid = started.get()
+        workers[path] = pid
+    alive = set(process.pid for process in multiprocessing.active_children())
+    now = time.time()
+    for path in running:
+        if path not in workers or workers[path] in alive or async_results[path].ready():
+            continue
+        # the result may still be on its way from the exited worker
+        if now - exited.setdefault(path, now) > LOST_WORKER_GRACE:
+            return new_stats(path, "worker process exited without a result, killed when out of memory?")
+    return None
+
+
+def run_jobs(jobs, processes, memory_budget):
+    """Export the jobs in a pool of processes, return the statistics in job order.
+
+    Large files are started first. A file is only started while the estimated memory of the running
+    exports stays within memory_budget (None: no limit), a single file is always started.
+    A file whose worker process dies is reported as failed.
+    """
+    pending = sorted(jobs, key=lambda job: os.path.getsize(job[0]), reverse=True)
+    results = {}
+    if processes <= 1:
+        for job in pending:
+            results[job[0]] = report(export_file(job), len(results) + 1, len(jobs))
+        return [results[job[0]] for job in jobs]
+
+    finished = queue.Queue()
+    # SimpleQueue writes to the pipe at once, the start of a worker killed right after is still seen
+    started = multiprocessing.SimpleQueue()
+    running = {}
+    async_results = {}
+    workers = {}
+    exited = {}
+    # every worker exits after its file, the memory of a large export is returned at once
+    pool = multiprocessing.Pool(processes, init_worker, (started,), maxtasksperchild=1)
+    lost = False
+    try:
+        while pending or running:
+            while pending and len(running) < processes:
+                need = estimated_memory(pending[0][0])
+                if running and memory_budget is not None and sum(running.values()) + need > memory_budget:
+                    break
+                job = pending.pop(0)
+                running[job[0]] = need
+                async_results[job[0]] = pool.apply_async(
+                    export_file, (job,), callback=finished.put,
+                    error_callback=functools.partial(export_failed, finished, job[0]))
+            try:
+                stats = finished.get(timeout=1.0)
+            except queue.Empty:
+                stats = find_lost_export(running, async_results, started, workers, exited)
+                if stats is None:
+                    continue
+                lost = True
+            if stats["file"] not in running:
+                # late result of a file already reported
+                continue
+            del running[stats["file"]]
+            results[stats["file"]] = report(stats, len(results) + 1, len(jobs))
+    finally:
+        if lost:
+            # the pool waits forever for the result of a lost worker
+            pool.terminate()
+        else:
+            pool.close()
+        pool.join()
+    return [results[job[0]] for job in jobs]
+
+
+def report(stats, done, total):
+    state = "failed: " + stats["error"] if stats["error"] else "{:.1f} s".format(stats["load"] + stats["write"])
+    print("[{}/{}] {} {}".format(done, total, os.path.basename(stats["file"]), state), flush=True)
+    return stats
+
+
+def print_summary(results, elapsed):
+    row = "{:<40} {:>8} {:>5} {:>7} {:>8} {:>7} {:>7} {:>7} {:>7}"
+    print()
+    print(row.format("file", "MB", "chan", "frames", "signals", "load s", "write s", "total s", "MB/s"))
+    for stats in results:
+        megabytes = stats["size"] / 1e6
+        total = stats["load"] + stats["write"]
+        if stats["error"]:
+            print(row.format(os.path.basename(stats["file"])[:40], "{:.1f}".format(megabytes), "", "", "", "", "",
+                             "", "failed"))
+            continue
+        print(row.format(os.path.basename(stats["file"])[:40], "{:.1f}".format(megabytes), stats["channels"],
+                         stats["frames"], stats["signals"], "{:.2f}".format(stats["load"]),
+                         "{:.2f}".format(stats["write"]), "{:.2f}".format(total),
+                         "{:.2f}".format(megabytes / total if total else 0.0)))
+    exported = [stats for stats in results if not stats["error"]]
+    megabytes = sum(stats["size"] for stats in exported) / 1e6
+    print("{} of {} files exported, {:.1f} MB in {:.1f} s wall time ({:.2f} MB/s)".format(
+        len(exported), len(results), megabytes, elapsed, megabytes / elapsed if elapsed else 0.0))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the signal info tables of arxml files.")
+    parser.add_argument("inputs", nargs="+", help="arxml files, directories (searched recursively) or glob patterns")
+    parser.add_argument("-o", "--output", default=".", help="output folder of the workbooks (default: .)")
+    parser.add_argument("-j", "--jobs", type=int, default=multiprocessing.cpu_count(),
+                        help="maximum number of files exported at once (default: cpu count)")
+    parser.add_argument("--max-memory", type=int, default=None, metavar="MB",
+                        help="memory the running exports may use (default: available physical memory)")
+    parser.add_argument("--per-channel", action="store_true", help="write one workbook per channel")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only write workbooks whose channels changed since the last export")
+    parser.add_argument("--cache-dir", default=None, help="cache the loaded arxml models in this folder")
+    args = parser.parse_args(argv)
+
+    files = find_arxml_files(args.inputs)
+    if not files:
+        parser.error("no arxml files found")
+    # the workbooks are named after the input file name, equal names would overwrite each other
+    names = {}
+    for path in files:
+        names.setdefault(os.path.basename(path), []).append(path)
+    duplicates = [paths for paths in names.values() if len(paths) > 1]
+    if duplicates:
+        parser.error("input files with the same name: " + "; ".join(", ".join(paths) for paths in duplicates))
+    if not os.path.isdir(args.output):
+        os.makedirs(args.output)
+
+    memory_budget = args.max_memory * 1024 * 1024 if args.max_memory else available_memory()
+    processes = max(1, min(args.jobs, len(files)))
+    print("exporting {} files with up to {} processes".format(len(files), processes), flush=True)
+
+    start = time.time()
+    jobs = [(path, args.output, args.per_channel, args.incremental, args.cache_dir) for path in files]
+    results = run_jobs(jobs, processes, memory_budget)
+    print_summary(results, time.time() - start)
+    return 1 if any(stats["error"] for stats in results) else 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
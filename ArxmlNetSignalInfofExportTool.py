@@ -1,7 +1,9 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+# write the version of canmatrix once before freezing, the exe then does not look for git at startup:
+# D:\000_Programs\Python\Python37\python.exe -c "import canmatrix._version; canmatrix._version.write_static_versions()"
 # D:\000_Programs\Python\Python37\python.exe D:\000_Programs\Anaconda3\Scripts\pyinstaller.exe -F ArxmlNetSignalInfofExportTool.py -w -i Panda_001.ico
-from PyQt5.QtCore import Qt, pyqtSlot
+from PyQt5.QtCore import Qt, pyqtSlot, pyqtSignal, QThread
 from PyQt5.QtGui import QStandardItemModel, QStandardItem
 from PyQt5.QtWidgets import QTableView, QApplication, QAction, QMessageBox, QMainWindow, QWidget, QDialog
 from PyQt5.QtWidgets import QFileDialog, QTableWidgetItem, QHeaderView
@@ -23,6 +25,58 @@ logger = canmatrix.log.setup_logger()
 canmatrix.log.set_log_level(logger, 0)
 
 
+# status bar text of the export phases
+PHASE_NAMES = {
+    "parse": "Parsing arxml",
+    "index": "Indexing arxml",
+    "decode": "Decoding channels",
+    "decode_can": "Decoding CAN frames",
+    "decode_flexray": "Decoding FlexRay frames",
+    "decode_ethernet": "Decoding Ethernet PDUs",
+    "write": "Writing signal info table",
+}
+
+
+class ExportWorker(QThread):
+    """
+    Load the arxml file and write the signal info table outside of the GUI thread.
+
+    Cancel with requestInterruption(), the export stops at the next check and emits cancelled.
+    """
+    progress = pyqtSignal(str, int)  # phase, percent of the phase
+    exported = pyqtSignal(list)  # written workbooks
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, inputFilePath, outputFolderPath, parent=None):
+        super(ExportWorker, self).__init__(parent)
+        self.inputFilePath = inputFilePath
+        self.outputFolderPath = outputFolderPath
+        self.lastProgress = None
+
+    def report(self, phase, done, total):
+        # called for every frame, only changes of the shown percent are sent to the GUI thread
+        percent = 100 * done // total if total else 100
+        if (phase, percent) != self.lastProgress:
+            self.lastProgress = (phase, percent)
+            self.progress.emit(phase, percent)
+
+    def run(self):
+        try:
+            cluster, ns = Function_NetSignalInfofExport.arxml_file_load(
+                self.inputFilePath, self.report, self.isInterruptionRequested)
+            outfiles = Function_NetSignalInfofExport.dump_signal_info(
+                cluster, self.inputFilePath.split("\\")[-1], self.outputFolderPath,
+                progress=self.report, cancelled=self.isInterruptionRequested)
+        except Function_NetSignalInfofExport.ExportCancelled:
+            self.cancelled.emit()
+        except Exception as error:
+            logger.exception("export of %s failed", self.inputFilePath)
+            self.failed.emit(str(error))
+        else:
+            self.exported.emit(outfiles)
+
+
 class MainWindow(QMainWindow, Ui_NetSignalInfoExportTool):
     """
     Class documentation goes here.
@@ -40,6 +94,7 @@ class MainWindow(QMainWindow, Ui_NetSignalInfoExportTool):
         self.setupUi(self)
         self.ArxmlInputFilePath = ""
         self.SignalInfoTableFolderPath = ""
+        self.exportWorker = None
 
     @pyqtSlot()
     def on_pushButton_DatabaseFileInputSelect_clicked(self):
@@ -74,16 +129,62 @@ class MainWindow(QMainWindow, Ui_NetSignalInfoExportTool):
     @pyqtSlot()
     def on_pushButton_GenerateSignalInfoTable_clicked(self):
         """
-        Slot documentation goes here.
+        Start the export in the background, progress is shown in the progress and status bar.
         """
-        cluster, ns = Function_NetSignalInfofExport.arxml_file_load(
-            self.ArxmlInputFilePath)
-        Function_NetSignalInfofExport.dump_signal_info(
-            cluster, self.ArxmlInputFilePath.split("\\")[-1], self.SignalInfoTableFolderPath)
+        if self.exportWorker is not None:
+            return
+        self.exportWorker = ExportWorker(self.ArxmlInputFilePath, self.SignalInfoTableFolderPath, self)
+        self.exportWorker.progress.connect(self.show_export_progress)
+        self.exportWorker.exported.connect(self.export_done)
+        self.exportWorker.failed.connect(self.export_failed)
+        self.exportWorker.cancelled.connect(self.export_cancelled)
+        self.pushButton_GenerateSignalInfoTable.setEnabled(False)
+        self.pushButton_Cancel.setEnabled(True)
+        self.progressBar_Export.setValue(0)
+        self.exportWorker.start()
         logger.info('pushButton_GenerateSignalInfoTable.')
+
+    @pyqtSlot()
+    def on_pushButton_Cancel_clicked(self):
+        """
+        Ask the running export to stop, no incomplete workbook is written.
+        """
+        if self.exportWorker is not None:
+            self.exportWorker.requestInterruption()
+            self.pushButton_Cancel.setEnabled(False)
+            self.statusbar.showMessage('Cancelling...')
+
+    def show_export_progress(self, phase, percent):
+        self.progressBar_Export.setValue(percent)
+        self.statusbar.showMessage('%s: %d%%' % (PHASE_NAMES.get(phase, phase), percent))
+
+    def finish_export(self, message):
+        self.exportWorker.wait()
+        self.exportWorker = None
+        self.pushButton_GenerateSignalInfoTable.setEnabled(True)
+        self.pushButton_Cancel.setEnabled(False)
+        self.statusbar.showMessage(message)
+
+    def export_done(self, outfiles):
+        self.finish_export('Net Signal Info Table generated.')
         QMessageBox.information(
             self, u'Tips', 'Net Signal Info Table successfully generated based on arxml database.')
 
+    def export_failed(self, message):
+        self.finish_export('Export failed.')
+        QMessageBox.critical(
+            self, u'Error', 'Net Signal Info Table could not be generated: ' + message)
+
+    def export_cancelled(self):
+        self.progressBar_Export.setValue(0)
+        self.finish_export('Export cancelled.')
+
+    def closeEvent(self, event):
+        # stop a running export, the thread must not outlive the window
+        if self.exportWorker is not None:
+            self.exportWorker.requestInterruption()
+            self.exportWorker.wait()
+        super(MainWindow, self).closeEvent(event)
 
 if __name__ == "__main__":
     import sys
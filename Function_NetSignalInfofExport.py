@@ -1,8 +1,13 @@
 #!/usr/bin/python3.5
+import canmatrix
 import canmatrix.formats
+import collections
+import hashlib
+import json
 import logging
+import multiprocessing
+import os
 import canmatrix.log
-import lxml.etree
 import canmatrix.formats.arxml
 import canmatrix.formats.xlsx
 
@@ -10,25 +15,164 @@ logger = canmatrix.log.setup_logger()
 canmatrix.log.set_log_level(logger, -1)
 
 
-def arxml_file_load(inputfileName):
+# raised when the cancelled callback returns True, no incomplete workbook is left behind
+ExportCancelled = canmatrix.OperationCancelled
+
+
+def check_cancelled(cancelled):
+    if cancelled is not None and cancelled():
+        raise ExportCancelled()
+
+
+def partial_file(outfile):
+    # workbooks are written to this file first and renamed when complete
+    return outfile + ".part"
+
+
+def write_workbook(outfile, cluster, progress=None, cancelled=None):
+    """Write the xlsx workbook of cluster to outfile, outfile is replaced only by a complete workbook."""
+    part = partial_file(outfile)
+    try:
+        with open(part, "wb") as file_object:
+            canmatrix.formats.xlsx.dump(cluster, file_object, progress=progress, cancelled=cancelled)
+        os.replace(part, outfile)
+    except BaseException:
+        remove_partial_files([outfile])
+        raise
+    return outfile
+
+
+def remove_partial_files(outfiles):
+    for outfile in outfiles:
+        try:
+            os.remove(partial_file(outfile))
+        except OSError:
+            pass
+
+
+def arxml_file_load(inputfileName, progress=None, cancelled=None, **options):
     #infile = os.getcwd() + "\\"+inputfileName
 
-    cluster = canmatrix.formats.arxml.load(inputfileName)
+    # options are passed to the arxml loader, e.g. arxmlCacheDir
+    cluster = canmatrix.formats.arxml.load(inputfileName, progress=progress, cancelled=cancelled, **options)
     if cluster is None:
         logger.debug("cluster loaded is none.")
-    tree = lxml.etree.parse(inputfileName)
-    ns = "{" + tree.xpath('namespace-uri(.)') + "}"
-    return cluster, ns
-
-
-def dump_signal_info(signalDescriptionDB, inputFileName, outputFolderPath):
-    outfile = outputFolderPath+r'\\' + "SignalInfoExport_" + inputFileName + ".xlsx"
-    for name in signalDescriptionDB:
-        db = signalDescriptionDB[name]
-        file_object = open(outfile, "wb")
-        #canmatrix.formats.dump(db, file_object,'xlsx')
-        canmatrix.formats.xlsx.dump(signalDescriptionDB, file_object)
-        file_object.close()
+    # the namespace is read while loading, the file is parsed only once
+    return cluster, cluster.namespace
+
+
+def dump_channel_workbook(job):
+    # write the workbook of one channel, job is (output file, channel name, CanMatrix of the channel)
+    outfile, name, db = job
+    return write_workbook(outfile, {name: db})
+
+
+def fingerprint_file(inputFileName, outputFolderPath):
+    # fingerprints of the outputs written by incremental exports of inputFileName
+    return os.path.join(outputFolderPath, "SignalInfoExport_" + inputFileName + ".fingerprints.json")
+
+
+def read_fingerprints(path):
+    """Read the output file name -> fingerprint map of an earlier export, empty if there is none.
+
+    Fingerprints written by another canmatrix version are discarded, its workbooks may differ.
+    """
+    try:
+        with open(path, "r") as file_object:
+            manifest = json.load(file_object)
+    except (IOError, OSError, ValueError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get("canmatrix") != canmatrix.__version__:
+        return {}
+    return manifest.get("outputs", {})
+
+
+def write_fingerprints(path, fingerprints):
+    with open(path, "w") as file_object:
+        json.dump({"canmatrix": canmatrix.__version__, "outputs": fingerprints}, file_object,
+                  indent=1, sort_keys=True)
+
+
+def dump_signal_info(signalDescriptionDB, inputFileName, outputFolderPath, per_channel=False, workers=1,
+                     incremental=False, progress=None, cancelled=None):
+    """Write the signal info workbook(s) of the cluster, return the file names of the workbooks.
+
+    By default one workbook with a sheet per channel is written in a single pass.
+    With per_channel each channel gets its own workbook SignalInfoExport_<input>_<channel>.xlsx,
+    these are written by a pool of worker processes if workers > 1.
+    With incremental the content fingerprint of every channel is recorded next to the workbooks in
+    SignalInfoExport_<input>.fingerprints.json, a workbook is only written again if the fingerprint of
+    its channels changed or the workbook is missing.
+
+    progress is called as progress("write", frames written, frames to write) for every workbook, by a
+    pool of workers as progress("write", workbooks written, workbooks to write). cancelled is checked
+    after every frame (with workers after every workbook), if it returns True the export stops with
+    ExportCancelled.
+    Workbooks are renamed into place when complete, a cancelled or failed export leaves the
+    existing workbooks unchanged.
+    """
+    if not per_channel:
+        outfile = os.path.join(outputFolderPath, "SignalInfoExport_" + inputFileName + ".xlsx")
+        jobs = [(outfile, None, signalDescriptionDB)]
+    else:
+        jobs = [(os.path.join(outputFolderPath, "SignalInfoExport_" + inputFileName + "_" + name + ".xlsx"),
+                 name, signalDescriptionDB[name]) for name in signalDescriptionDB]
+
+    if incremental:
+        manifest = fingerprint_file(inputFileName, outputFolderPath)
+        known = read_fingerprints(manifest)
+        channel_fingerprints = {name: signalDescriptionDB[name].fingerprint() for name in signalDescriptionDB}
+        fingerprints = {}
+        for outfile, name, _ in jobs:
+            if name is None:
+                # the workbook of all channels changes with any channel and with the order of the sheets
+                fingerprints[outfile] = hashlib.sha1("".join(
+                    channel + ":" + channel_fingerprints[channel] + "\n" for channel in signalDescriptionDB
+                ).encode("utf-8")).hexdigest()
+            else:
+                fingerprints[outfile] = channel_fingerprints[name]
+        outputs = [job[0] for job in jobs]
+        jobs = [job for job in jobs
+                if known.get(os.path.basename(job[0])) != fingerprints[job[0]] or not os.path.exists(job[0])]
+        logger.info("%d of %d workbooks unchanged", len(outputs) - len(jobs), len(outputs))
+
+    written = []
+    if per_channel and workers > 1 and len(jobs) > 1:
+        # at most one job per worker is submitted, on cancel no new jobs are submitted and the running
+        # ones are completed (terminating the pool can hang while it still sends a job to a worker)
+        processes = min(workers, len(jobs))
+        if progress is not None:
+            progress("write", 0, len(jobs))
+        pool = multiprocessing.Pool(processes)
+        remaining = collections.deque(jobs)
+        running = collections.deque()
+        stop = False
+        try:
+            while remaining or running:
+                while remaining and len(running) < processes and not stop:
+                    running.append(pool.apply_async(dump_channel_workbook, (remaining.popleft(),)))
+                if not running:
+                    break
+                written.append(running.popleft().get())
+                if progress is not None:
+                    progress("write", len(written), len(jobs))
+                stop = stop or bool(remaining and cancelled is not None and cancelled())
+        finally:
+            pool.close()
+            pool.join()
+        if stop:
+            raise ExportCancelled()
+    else:
+        for outfile, name, db in jobs:
+            check_cancelled(cancelled)
+            written.append(write_workbook(outfile, db if name is None else {name: db}, progress, cancelled))
+
+    if not incremental:
+        return written
+    for outfile in written:
+        known[os.path.basename(outfile)] = fingerprints[outfile]
+    write_fingerprints(manifest, known)
+    return outputs
 
 
 if __name__ == "__main__":
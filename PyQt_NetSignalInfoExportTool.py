@@ -111,6 +111,24 @@ class Ui_NetSignalInfoExportTool(object):
         self.pushButton_GenerateSignalInfoTable.setLayoutDirection(QtCore.Qt.LeftToRight)
         self.pushButton_GenerateSignalInfoTable.setObjectName("pushButton_GenerateSignalInfoTable")
         self.gridLayout.addWidget(self.pushButton_GenerateSignalInfoTable, 3, 0, 1, 1, QtCore.Qt.AlignHCenter)
+        self.horizontalLayout_3 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_3.setContentsMargins(-1, 10, -1, 10)
+        self.horizontalLayout_3.setObjectName("horizontalLayout_3")
+        self.progressBar_Export = QtWidgets.QProgressBar(self.centralwidget)
+        self.progressBar_Export.setMinimumSize(QtCore.QSize(0, 30))
+        self.progressBar_Export.setProperty("value", 0)
+        self.progressBar_Export.setObjectName("progressBar_Export")
+        self.horizontalLayout_3.addWidget(self.progressBar_Export)
+        self.pushButton_Cancel = QtWidgets.QPushButton(self.centralwidget)
+        self.pushButton_Cancel.setEnabled(False)
+        self.pushButton_Cancel.setMinimumSize(QtCore.QSize(100, 30))
+        font = QtGui.QFont()
+        font.setFamily("Adobe 宋体 Std L")
+        font.setPointSize(14)
+        self.pushButton_Cancel.setFont(font)
+        self.pushButton_Cancel.setObjectName("pushButton_Cancel")
+        self.horizontalLayout_3.addWidget(self.pushButton_Cancel)
+        self.gridLayout.addLayout(self.horizontalLayout_3, 4, 0, 1, 1)
         NetSignalInfoExportTool.setCentralWidget(self.centralwidget)
         self.menubar = QtWidgets.QMenuBar(NetSignalInfoExportTool)
         self.menubar.setGeometry(QtCore.QRect(0, 0, 1050, 21))
@@ -135,4 +153,5 @@ class Ui_NetSignalInfoExportTool(object):
         self.pushButton_OutputFolderSelect.setText(_translate("NetSignalInfoExportTool", "Select"))
         self.Label__ToolTitle.setText(_translate("NetSignalInfoExportTool", "Net Signal Info Export Tool"))
         self.pushButton_GenerateSignalInfoTable.setText(_translate("NetSignalInfoExportTool", "Generate  Signal  Info  Table"))
+        self.pushButton_Cancel.setText(_translate("NetSignalInfoExportTool", "Cancel"))
 
@@ -25,7 +25,8 @@ from canmatrix.canmatrix import (
     MissingMuxSignal,
     DecodingComplexMultiplexed,
     DecodingFrameLength,
-    ArbitrationIdOutOfRange
+    ArbitrationIdOutOfRange,
+    OperationCancelled,
 )
 
 # todo remove this later
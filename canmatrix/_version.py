@@ -13,7 +13,6 @@
 import errno
 import os
 import re
-import subprocess
 import sys
 import typing
 
@@ -71,6 +70,7 @@ def register_vcs_handler(vcs, method):  # tyoe: (str, str) -> typing.Callable  #
 def run_command(commands, args, cwd=None, verbose=False, hide_stderr=False,
                 env=None):
     """Call the given command(s)."""
+    import subprocess  # only needed if git is asked, not with a static version
     assert isinstance(commands, list)
     p = None
     for c in commands:
@@ -475,6 +475,39 @@ def render(pieces, style):
             "date": pieces.get("date")}
 
 
+STATIC_VERSION_FILE = "_static_version.py"
+
+
+def versions_from_static_file():
+    """Get the version information written by write_static_versions()."""
+    try:
+        from canmatrix._static_version import versions
+    except ImportError:
+        raise NotThisMethod("no static version file")
+    return versions
+
+
+def write_static_versions(path=None):
+    """Compute the version information and write it to _static_version.py.
+
+    Run this when building or freezing (PyInstaller) canmatrix, get_versions()
+    then returns the written version without calling git. Delete the file to
+    return to the version of the git checkout.
+    """
+    if path is None:
+        path = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                            STATIC_VERSION_FILE)
+    if os.path.exists(path):
+        os.remove(path)
+    sys.modules.pop("canmatrix._static_version", None)
+    versions = get_versions()
+    with open(path, "w") as f:
+        f.write("# This file was generated by canmatrix._version."
+                "write_static_versions().\n")
+        f.write("versions = %r\n" % (versions,))
+    return versions
+
+
 def get_versions():
     """Get version information or return default if unable to do so."""
     # I am in _version.py, which lives at ROOT/VERSIONFILE_SOURCE. If we have
@@ -485,12 +518,24 @@ def get_versions():
     cfg = get_config()
     verbose = cfg.verbose
 
+    try:
+        return versions_from_static_file()
+    except NotThisMethod:
+        pass
+
     try:
         return git_versions_from_keywords(get_keywords(), cfg.tag_prefix,
                                           verbose)
     except NotThisMethod:
         pass
 
+    if getattr(sys, "frozen", False):
+        # a frozen executable has no source tree to run git in
+        return {"version": "0+unknown", "full-revisionid": None,
+                "dirty": None,
+                "error": "no static version file in frozen build",
+                "date": None}
+
     try:
         root = os.path.realpath(__file__)
         # versionfile_source is the relative path from the top of the source
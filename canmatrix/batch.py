@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+Vectorized decoding of many received frames at once, needs numpy.
+
+Rows of a payload matrix are grouped by frame, every signal of a frame is extracted for all
+its rows with numpy shift and mask operations.
+"""
+from __future__ import absolute_import, division, print_function
+
+import logging
+import typing
+from builtins import *
+
+import attr
+import numpy
+
+import canmatrix
+
+logger = logging.getLogger(__name__)
+
+
+@attr.s(cmp=False)
+class DecodedBatch(object):
+    """
+    Column arrays of the decoded rows of one frame.
+
+    * rows: indices of the decoded rows in the given payload matrix,
+    * raw: signal name -> raw values (int64, uint64 for unsigned 64 bit signals, float for float signals),
+    * phys: signal name -> physical values as float64, NaN for rows where a multiplexed signal is not sent.
+    """
+
+    frame = attr.ib()  # type: canmatrix.Frame
+    rows = attr.ib()  # type: numpy.ndarray
+    raw = attr.ib(factory=dict)  # type: typing.MutableMapping[str, numpy.ndarray]
+    phys = attr.ib(factory=dict)  # type: typing.MutableMapping[str, numpy.ndarray]
+
+
+def find_frame(db, arbitration_id, extended=None):
+    # type: (canmatrix.CanMatrix, int, typing.Optional[bool]) -> typing.Optional[canmatrix.Frame]
+    """Get the frame of a received id like CanMatrix.decode, j1939 frames are also found by pgn."""
+    try:
+        frame_id = canmatrix.ArbitrationId(arbitration_id, extended)
+    except canmatrix.ArbitrationIdOutOfRange:
+        return None
+    frame = db.frame_by_id(frame_id)
+    if frame is None and extended and db.contains_j1939:
+        frame = db.frame_by_pgn(frame_id.pgn)
+    return frame
+
+
+def assemble_bytes(data, byte_weights):
+    # type: (numpy.ndarray, typing.Sequence[typing.Tuple[int, int]]) -> numpy.ndarray
+    """Combine the columns (byte index, bit weight) of data to one uint64 column."""
+    window = numpy.zeros(data.shape[0], dtype=numpy.uint64)
+    for byte, weight in byte_weights:
+        window |= data[:, byte].astype(numpy.uint64) << numpy.uint64(weight)
+    return window
+
+
+def extract_raw(signal, data):
+    # type: (canmatrix.Signal, numpy.ndarray) -> numpy.ndarray
+    """
+    Extract the raw values of signal from all rows of data, same bit layout like Frame.unpack.
+
+    :param signal: signal to extract
+    :param data: uint8 matrix, one row per received frame, at least frame size columns
+    :return: raw values of the signal
+    """
+    first = signal.start_bit // 8
+    last = (signal.start_bit + signal.size - 1) // 8
+    if signal.is_little_endian:
+        shift = signal.start_bit - 8 * first
+        weights = [(byte, 8 * (byte - first)) for byte in range(first, last + 1)]
+    else:
+        shift = 8 * (last + 1) - signal.start_bit - signal.size
+        weights = [(byte, 8 * (last - byte)) for byte in range(first, last + 1)]
+
+    if len(weights) <= 8:
+        window = assemble_bytes(data, weights) >> numpy.uint64(shift)
+    else:
+        # an unaligned signal of more than 57 bits spans 9 bytes: the byte at the most significant end
+        # does not fit the window, it is shifted in separately
+        if signal.is_little_endian:
+            top_byte, weights = weights[-1][0], weights[:-1]
+        else:
+            top_byte, weights = weights[0][0], weights[1:]
+        window = assemble_bytes(data, weights) >> numpy.uint64(shift)
+        window |= data[:, top_byte].astype(numpy.uint64) << numpy.uint64(64 - shift)
+    raw = window & numpy.uint64((1 << signal.size) - 1)
+
+    if signal.is_float:
+        if signal.size == 32:
+            with numpy.errstate(invalid="ignore"):  # signaling NaN payloads
+                return raw.astype(numpy.uint32).view(numpy.float32).astype(numpy.float64)
+        return raw.view(numpy.float64)
+    if signal.size == 64:
+        return raw.view(numpy.int64) if signal.is_signed else raw
+    if signal.is_signed:
+        # sign extension in 64 bit arithmetic: flip the sign bit and subtract its weight,
+        # 1 << signal.size does not fit into int64 for 63 bit signals
+        sign_bit = numpy.uint64(1 << (signal.size - 1))
+        return (raw ^ sign_bit).astype(numpy.int64) - numpy.int64(sign_bit)
+    return raw.astype(numpy.int64)
+
+
+def decode_frame_batch(frame, data, rows=None):
+    # type: (canmatrix.Frame, numpy.ndarray, typing.Optional[numpy.ndarray]) -> DecodedBatch
+    """
+    Decode all rows of data as frame.
+
+    :param frame: Frame of all rows
+    :param data: uint8 matrix, one payload per row, shorter payloads padded with zeros
+    :param rows: row indices to report in the result, default all rows of data
+    :return: DecodedBatch of the frame
+    """
+    data = numpy.asarray(data, dtype=numpy.uint8)
+    if data.shape[1] < frame.size:
+        data = numpy.pad(data, ((0, 0), (0, frame.size - data.shape[1])), "constant")
+    decoded = DecodedBatch(frame, numpy.arange(data.shape[0]) if rows is None else rows)
+
+    for signal in frame.signals:
+        if signal.size <= 0 or signal.start_bit < 0 or signal.start_bit + signal.size > frame.size * 8 or \
+                (signal.is_float and signal.size not in (32, 64)):
+            logger.warning("signal %s does not fit into frame %s, not decoded", signal.name, frame.name)
+            continue
+        raw = extract_raw(signal, data)
+        decoded.raw[signal.name] = raw
+        factor, offset = signal.scaling("float")
+        decoded.phys[signal.name] = raw.astype(numpy.float64) * factor + offset
+
+    if frame.is_multiplexed and not frame.is_complex_multiplexed:
+        multiplexer = frame.get_multiplexer
+        if multiplexer is not None and multiplexer.name in decoded.raw:
+            mux_values = decoded.raw[multiplexer.name]
+            for signal in frame.signals:
+                if signal.mux_val is not None and signal.name in decoded.phys:
+                    decoded.phys[signal.name][mux_values != signal.mux_val] = numpy.nan
+    return decoded
+
+
+def decode_batch(db, arbitration_ids, payloads, extended=None):
+    # type: (canmatrix.CanMatrix, typing.Any, typing.Any, typing.Any) -> typing.Dict[str, DecodedBatch]
+    """
+    Decode many received frames at once.
+
+    :param db: CanMatrix to decode with
+    :param arbitration_ids: array of N arbitration ids
+    :param payloads: uint8 matrix of shape (N, 64) (or any width), one payload per row, padded with zeros
+    :param extended: optional array of N booleans, extended flag of each id
+    :return: frame name -> DecodedBatch, rows of unknown ids are left out
+    """
+    ids = numpy.asarray(arbitration_ids, dtype=numpy.int64).ravel()
+    payloads = numpy.asarray(payloads, dtype=numpy.uint8)
+    if payloads.ndim != 2 or payloads.shape[0] != ids.shape[0]:
+        raise ValueError("payloads must be a matrix with one row per arbitration id")
+    if extended is None:
+        keys = ids
+    else:
+        keys = ids * 2 + numpy.asarray(extended, dtype=bool).ravel()
+
+    # one frame index per distinct id, -1 for ids not in the matrix
+    unique_keys, key_of_row = numpy.unique(keys, return_inverse=True)
+    frames = []  # type: typing.List[canmatrix.Frame]
+    frame_indices = {}  # type: typing.Dict[int, int]
+    frame_of_key = numpy.full(len(unique_keys), -1, dtype=numpy.int64)
+    for key_index, key in enumerate(unique_keys.tolist()):
+        frame = find_frame(db, key, None) if extended is None else find_frame(db, key >> 1, bool(key & 1))
+        if frame is None:
+            continue
+        frame_index = frame_indices.get(id(frame))
+        if frame_index is None:
+            frame_index = frame_indices[id(frame)] = len(frames)
+            frames.append(frame)
+        frame_of_key[key_index] = frame_index
+    frame_of_row = frame_of_key[key_of_row]
+
+    unknown = numpy.count_nonzero(frame_of_row < 0)
+    if unknown:
+        logger.debug("%d rows with unknown arbitration ids not decoded", unknown)
+
+    order = numpy.argsort(frame_of_row, kind="stable")
+    counts = numpy.bincount(frame_of_row + 1, minlength=len(frames) + 1)
+    groups = numpy.split(order, numpy.cumsum(counts)[:-1])
+
+    decoded = {}  # type: typing.Dict[str, DecodedBatch]
+    for frame, rows in zip(frames, groups[1:]):
+        decoded[frame.name] = decode_frame_batch(frame, payloads[rows, :frame.size], rows)
+    return decoded
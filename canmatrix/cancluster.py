@@ -7,58 +7,163 @@ from builtins import *
 import canmatrix
 
 
+def merge_frame(known, frame):  # type: (canmatrix.Frame, canmatrix.Frame) -> None
+    for transmitter in frame.transmitters:
+        known.add_transmitter(transmitter)
+    for receiver in frame.receivers:
+        known.add_receiver(receiver)
+
+
+def merge_signal(known, signal):  # type: (canmatrix.Signal, canmatrix.Signal) -> None
+    for receiver in signal.receivers:
+        known.add_receiver(receiver)
+
+
+class MergedView(object):
+    """
+    Objects of all matrices deduplicated by name.
+
+    The first object of a name is kept, later objects of the same name are merged into it.
+    """
+
+    def __init__(self, merge=None):  # type: (typing.Optional[typing.Callable[[typing.Any, typing.Any], None]]) -> None
+        self.merge = merge
+        self.items = []  # type: typing.List[typing.Any]
+        self.by_name = {}  # type: typing.Dict[str, typing.Any]
+        self.counts = {}  # type: typing.Dict[str, int]
+
+    def clear(self):  # type: () -> None
+        self.items = []
+        self.by_name = {}
+        self.counts = {}
+
+    def add(self, item):  # type: (typing.Any) -> None
+        self.counts[item.name] = self.counts.get(item.name, 0) + 1
+        known = self.by_name.get(item.name)
+        if known is None:
+            self.by_name[item.name] = item
+            self.items.append(item)
+        elif self.merge is not None:
+            self.merge(known, item)
+
+    def remove(self, removed):  # type: (typing.Iterable[typing.Any]) -> bool
+        """Remove the objects of a matrix, return False if the view has to be rebuilt.
+
+        That is the case if a kept object is removed while another matrix has an object of the same name.
+        """
+        removed_ids = set()
+        for item in removed:
+            removed_ids.add(id(item))
+            self.counts[item.name] -= 1
+            if not self.counts[item.name]:
+                del self.counts[item.name]
+        dropped = [item for item in self.items if id(item) in removed_ids]
+        if any(item.name in self.counts for item in dropped):
+            return False
+        if dropped:
+            self.items[:] = [item for item in self.items if id(item) not in removed_ids]
+            for item in dropped:
+                del self.by_name[item.name]
+        return True
+
+
+def matrix_frames(db):  # type: (canmatrix.CanMatrix) -> typing.Iterable[canmatrix.Frame]
+    return db.frames
+
+
+def matrix_signals(db):  # type: (canmatrix.CanMatrix) -> typing.Iterable[canmatrix.Signal]
+    for frame in db.frames:
+        for signal in frame.signals:
+            yield signal
+
+
+def matrix_ecus(db):  # type: (canmatrix.CanMatrix) -> typing.Iterable[canmatrix.Ecu]
+    return db.ecus
+
+
 class CanCluster(dict):
+    """
+    Matrices of several busses by name, with views of their frames, signals and ecus deduplicated by name.
+
+    The views are updated incrementally when a matrix is added or removed, call update() after
+    changing a matrix of the cluster.
+    """
 
     def __init__(self, *arg, **kw):
         super(CanCluster, self).__init__(*arg, **kw)
-        self._frames = []  # type: typing.List[canmatrix.Frame]
-        self._signals = []  # type: typing.List[canmatrix.Signal]
-        self._ecus = []  # type: typing.List[canmatrix.Ecu]
+        self._frames = MergedView(merge_frame)
+        self._signals = MergedView(merge_signal)
+        self._ecus = MergedView()
         self.update()
 
-    def update_frames(self):  # type: () -> typing.MutableSequence[canmatrix.Frame]
-        frames = []  # type: typing.List[canmatrix.Frame]
-        frame_names = []  # type: typing.List[str]
+    def _views(self):
+        return (self._frames, matrix_frames, self.update_frames), \
+               (self._signals, matrix_signals, self.update_signals), \
+               (self._ecus, matrix_ecus, self.update_ecus)
+
+    def _add_matrix(self, db):  # type: (canmatrix.CanMatrix) -> None
+        for view, items_of, _ in self._views():
+            for item in items_of(db):
+                view.add(item)
+
+    def _remove_matrix(self, db):  # type: (canmatrix.CanMatrix) -> None
+        for view, items_of, rebuild in self._views():
+            if not view.remove(items_of(db)):
+                rebuild()
+
+    def __reduce__(self):
+        # the views are rebuilt from the matrices
+        return self.__class__, (dict(self),)
+
+    def __setitem__(self, name, db):  # type: (str, canmatrix.CanMatrix) -> None
+        replaced = name in self
+        super(CanCluster, self).__setitem__(name, db)
+        if replaced:
+            self.update()
+        else:
+            self._add_matrix(db)
+
+    def __delitem__(self, name):  # type: (str) -> None
+        db = self[name]
+        super(CanCluster, self).__delitem__(name)
+        self._remove_matrix(db)
+
+    def pop(self, name, *default):
+        if name not in self:
+            return super(CanCluster, self).pop(name, *default)
+        db = super(CanCluster, self).pop(name)
+        self._remove_matrix(db)
+        return db
+
+    def popitem(self):
+        name, db = super(CanCluster, self).popitem()
+        self._remove_matrix(db)
+        return name, db
+
+    def setdefault(self, name, db=None):
+        if name not in self:
+            self[name] = db
+        return self[name]
+
+    def clear(self):  # type: () -> None
+        super(CanCluster, self).clear()
+        self.update()
+
+    def _rebuild(self, view, items_of):
+        view.clear()
         for matrixName in self:
-            for frame in self[matrixName].frames:  # type: canmatrix.Frame
-                if frame.name not in frame_names:
-                    frame_names.append(frame.name)
-                    frames.append(frame)
-                else:
-                    index = frame_names.index(frame.name)
-                    for transmitter in frame.transmitters:
-                        frames[index].add_transmitter(transmitter)
-                    for receiver in frame.receivers:
-                        frames[index].add_receiver(receiver)
-        self._frames = frames
-        return frames
+            for item in items_of(self[matrixName]):
+                view.add(item)
+        return view.items
+
+    def update_frames(self):  # type: () -> typing.MutableSequence[canmatrix.Frame]
+        return self._rebuild(self._frames, matrix_frames)
 
     def update_signals(self):  # type: () -> typing.MutableSequence[canmatrix.Signal]
-        signals = []  # type: typing.List[canmatrix.Signal]
-        signal_names = []  # type: typing.List[str]
-        for matrixName in self:
-            for frame in self[matrixName].frames:  # type: canmatrix.Frame
-                for signal in frame.signals:
-                    if signal.name not in signal_names:
-                        signal_names.append(signal.name)
-                        signals.append(signal)
-                    else:
-                        index = signal_names.index(signal.name)
-                        for receiver in signal.receivers:
-                            signals[index].add_receiver(receiver)
-        self._signals = signals
-        return signals
+        return self._rebuild(self._signals, matrix_signals)
 
     def update_ecus(self):  # type: () -> typing.MutableSequence[canmatrix.Ecu]
-        ecus = []  # type: typing.List[canmatrix.Ecu]
-        ecu_names = []  # type: typing.List[str]
-        for matrixName in self:
-            for ecu in self[matrixName].ecus:  # type: canmatrix.Ecu
-                if ecu.name not in ecu_names:
-                    ecu_names.append(ecu.name)
-                    ecus.append(ecu)
-        self._ecus = ecus
-        return ecus
+        return self._rebuild(self._ecus, matrix_ecus)
 
     def update(self):
         self.update_frames()
@@ -67,18 +172,18 @@ class CanCluster(dict):
 
     @property
     def ecus(self):  # type: () -> typing.MutableSequence[canmatrix.Ecu]
-        if not self._ecus:
+        if not self._ecus.items:
             self.update_ecus()
-        return self._ecus
+        return self._ecus.items
 
     @property
     def frames(self):  # type: () -> typing.MutableSequence[canmatrix.Frame]
-        if not self._frames:
+        if not self._frames.items:
             self.update_frames()
-        return self._frames
+        return self._frames.items
 
     @property
     def signals(self):  # type: () -> typing.MutableSequence[canmatrix.Signal]
-        if not self._signals:
+        if not self._signals.items:
             self.update_signals()
-        return self._signals
+        return self._signals.items
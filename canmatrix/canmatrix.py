@@ -30,6 +30,7 @@ from __future__ import absolute_import, division, print_function
 
 import decimal
 import fnmatch
+import fractions
 import itertools
 import logging
 import math
@@ -49,6 +50,12 @@ if attr.__version__ < '17.4.0':  # type: ignore
     raise RuntimeError("need attrs >= 17.4.0")
 logger = logging.getLogger(__name__)
 defaultFloatFactory = decimal.Decimal  # type: typing.Callable[[typing.Any], canmatrix.types.PhysicalValue]
+# numeric modes of the physical conversion of signals, "decimal" calculates with the exact model values
+numeric_factories = {
+    "decimal": decimal.Decimal,
+    "float": float,
+    "fraction": fractions.Fraction,
+}  # type: typing.Mapping[str, typing.Callable[[typing.Any], canmatrix.types.PhysicalValue]]
 
 class ExceptionTemplate(Exception):
     def __call__(self, *args):
@@ -61,6 +68,7 @@ class DecodingComplexMultiplexed(ExceptionTemplate): pass
 class DecodingFrameLength(ExceptionTemplate): pass
 class ArbitrationIdOutOfRange(ExceptionTemplate): pass
 class J1939needsExtendedIdetifier(ExceptionTemplate): pass
+class OperationCancelled(ExceptionTemplate): pass
 
 
 def arbitration_id_converter(source):  # type: (typing.Union[int, ArbitrationId]) -> ArbitrationId
@@ -68,6 +76,44 @@ def arbitration_id_converter(source):  # type: (typing.Union[int, ArbitrationId]
     return source if isinstance(source, ArbitrationId) else  ArbitrationId.from_compound_integer(source)
 
 
+@attr.s(cmp=False)
+class Progress(object):
+    """
+    Progress of a long running load or dump, created from the options "progress" and "cancelled".
+
+    * progress: callback(phase, units done, units total), called when a phase starts and after every unit,
+    * cancelled: callback() -> bool, checked at the same points, OperationCancelled is raised if it returns True.
+    """
+
+    progress = attr.ib(default=None)  # type: typing.Optional[typing.Callable[[str, int, int], None]]
+    cancelled = attr.ib(default=None)  # type: typing.Optional[typing.Callable[[], bool]]
+    phase = attr.ib(default=None, init=False)  # type: typing.Optional[str]
+    done = attr.ib(default=0, init=False)  # type: int
+    total = attr.ib(default=0, init=False)  # type: int
+
+    @classmethod
+    def from_options(cls, options):  # type: (typing.Mapping[str, typing.Any]) -> Progress
+        return cls(options.get("progress"), options.get("cancelled"))
+
+    def start(self, phase, total):  # type: (str, int) -> None
+        """Start phase of total units."""
+        self.phase = phase
+        self.done = 0
+        self.total = total
+        self.report()
+
+    def step(self, units=1):  # type: (int) -> None
+        """Count units as done."""
+        self.done += units
+        self.report()
+
+    def report(self):  # type: () -> None
+        if self.progress is not None:
+            self.progress(self.phase, self.done, self.total)
+        if self.cancelled is not None and self.cancelled():
+            raise OperationCancelled(self.phase)
+
+
 @attr.s
 class Ecu(object):
     """
@@ -120,7 +166,27 @@ def normalize_value_table(table):  # type: (typing.Mapping) -> typing.MutableMap
     return {int(k): v for k, v in table.items()}
 
 
-@attr.s(cmp=False)
+def lazy_container(name, factory):  # type: (str, typing.Callable[[], typing.Any]) -> property
+    """Property for the attrs field _name, the container is created by factory on first access.
+
+    Most signals, frames and groups keep their lists and dicts empty, allocating them lazily saves their memory.
+    """
+    private_name = "_" + name
+
+    def get_container(self):
+        container = getattr(self, private_name)
+        if container is None:
+            container = factory()
+            setattr(self, private_name, container)
+        return container
+
+    def set_container(self, container):
+        setattr(self, private_name, container)
+
+    return property(get_container, set_container)
+
+
+@attr.s(cmp=False, slots=True)
 class Signal(object):
     """
     Represents a Signal in CAN Matrix.
@@ -136,6 +202,7 @@ class Signal(object):
     * receivers  (ECU Name)
     * attributes, _values, unit, comment
     * _multiplex ('Multiplexor' or Number of Multiplex)
+    * numeric_mode ("decimal", "float" or "fraction", number type used by raw2phys and phys2raw)
     """
 
     name = attr.ib(default="")  # type: str
@@ -150,17 +217,19 @@ class Signal(object):
     factor = attr.ib(converter=float_factory, default=float_factory(1.0))  # type: canmatrix.types.PhysicalValue
 
     unit = attr.ib(default="")  # type: str
-    receivers = attr.ib(factory=list)  # type: typing.MutableSequence[str]
+    _receivers = attr.ib(default=None)  # type: typing.Optional[typing.MutableSequence[str]]
     comment = attr.ib(default=None)  # type: typing.Optional[str]
     multiplex = attr.ib(default=None)  # type: typing.Union[str, int]
 
     mux_value = attr.ib(default=None)
     is_float = attr.ib(default=False)  # type: bool
     enumeration = attr.ib(default=None)  # type: typing.Optional[str]
-    comments = attr.ib(factory=dict)  # type: typing.MutableMapping[int, str]
-    attributes = attr.ib(factory=dict)  # type: typing.MutableMapping[str, typing.Any]
-    values = attr.ib(converter=normalize_value_table, factory=dict)  # type: typing.MutableMapping[int, str]
-    mux_val_grp = attr.ib(factory=list)  # type: typing.MutableSequence[list]
+    _comments = attr.ib(default=None)  # type: typing.Optional[typing.MutableMapping[int, str]]
+    _attributes = attr.ib(default=None)  # type: typing.Optional[typing.MutableMapping[str, typing.Any]]
+    _values = attr.ib(
+        converter=lambda table: normalize_value_table(table) if table is not None else table,
+        default=None)  # type: typing.Optional[typing.MutableMapping[int, str]]
+    _mux_val_grp = attr.ib(default=None)  # type: typing.Optional[typing.MutableSequence[list]]
     muxer_for_signal = attr.ib(default=None)  # type: typing.Optional[str]
 
     # offset = attr.ib(converter=float_factory, default=0.0)  # type: float # ??
@@ -198,6 +267,21 @@ class Signal(object):
     def set_default_max(self):
         return self.set_max()
 
+    numeric_mode = attr.ib(default="decimal", validator=attr.validators.in_(numeric_factories))  # type: str
+    # factor and offset converted per numeric mode, see scaling
+    _scaling = attr.ib(default=None, init=False, repr=False)  # type: typing.Optional[typing.MutableMapping[str, typing.Tuple]]
+    # set by multiplex_setter
+    mux_val = attr.ib(default=None, init=False)  # type: typing.Optional[int]
+    is_multiplexer = attr.ib(default=False, init=False)  # type: bool
+
+    # containers allocated on first access, created empty if not given
+    lazy_fields = ("receivers", "comments", "attributes", "values", "mux_val_grp")
+    receivers = lazy_container("receivers", list)  # type: typing.MutableSequence[str]
+    comments = lazy_container("comments", dict)  # type: typing.MutableMapping[int, str]
+    attributes = lazy_container("attributes", dict)  # type: typing.MutableMapping[str, typing.Any]
+    values = lazy_container("values", dict)  # type: typing.MutableMapping[int, str]
+    mux_val_grp = lazy_container("mux_val_grp", list)  # type: typing.MutableSequence[list]
+
     def __attrs_post_init__(self):
         self.multiplex = self.multiplex_setter(self.multiplex)
 
@@ -221,8 +305,36 @@ class Signal(object):
             ret_multiplex = value
         return ret_multiplex
 
+    @property
+    def numeric_factory(self):  # type: () -> typing.Callable[[typing.Any], canmatrix.types.PhysicalValue]
+        """Number type of the numeric mode of the signal."""
+        if self.numeric_mode == "decimal":
+            return self.float_factory
+        return numeric_factories[self.numeric_mode]
+
+    def scaling(self, numeric_mode=None):
+        # type: (typing.Optional[str]) -> typing.Tuple[canmatrix.types.PhysicalValue, canmatrix.types.PhysicalValue]
+        """Get factor and offset of the signal converted to the number type of a numeric mode.
+
+        The conversion is done once and cached until factor or offset are changed.
+
+        :param str numeric_mode: "decimal", "float" or "fraction", default is the numeric mode of the signal.
+        :return: factor and offset
+        """
+        numeric_mode = self.numeric_mode if numeric_mode is None else numeric_mode
+        if numeric_mode == "decimal":
+            return self.factor, self.offset
+        if self._scaling is None:
+            self._scaling = {}
+        cached = self._scaling.get(numeric_mode)
+        if cached is None or cached[0] is not self.factor or cached[1] is not self.offset:
+            factory = numeric_factories[numeric_mode]
+            cached = (self.factor, self.offset, factory(self.factor), factory(self.offset))
+            self._scaling[numeric_mode] = cached
+        return cached[2], cached[3]
+
     def multiplexer_value_in_range(self, mux_value):
-        if len(self.mux_val_grp) > 0 and mux_value is not None:
+        if self._mux_val_grp and mux_value is not None:
             for mux_min, mux_max in self.mux_val_grp:
                 if mux_value >= mux_min and mux_value <= mux_max:
                     return True
@@ -240,7 +352,7 @@ class Signal(object):
         :param default: Default value if attribute doesn't exist.
         :return: Return the attribute value if found, else `default` or None
         """
-        if attributeName in attr.fields_dict(type(self)):
+        if attributeName in attr.fields_dict(type(self)) or attributeName in self.lazy_fields:
             return getattr(self, attributeName)
         if attributeName in self.attributes:
             return self.attributes[attributeName]
@@ -421,7 +533,10 @@ class Signal(object):
                 "Value {} is not valid for {}. Min={} and Max={}".format(
                     value, self, self.min, self.max)
                 )
-        raw_value = (value - self.offset) / self.factor
+        factor, offset = self.scaling()
+        if self.numeric_mode != "decimal":
+            value = self.numeric_factory(value)
+        raw_value = (value - offset) / factor
 
         if not self.is_float:
             raw_value = int(raw_value)
@@ -435,9 +550,10 @@ class Signal(object):
         :param bool decode_to_str: If True, try to get value representation as *string* ('Init' etc.)
         :return: physical value (scaled)
         """
+        factor, offset = self.scaling()
         if self.is_float:
-            value = self.float_factory(value)
-        result = value * self.factor + self.offset  # type: typing.Union[canmatrix.types.PhysicalValue, str]
+            value = self.numeric_factory(value)
+        result = value * factor + offset  # type: typing.Union[canmatrix.types.PhysicalValue, str]
         if decode_to_str:
             for value_key, value_string in self.values.items():
                 if value_key == result:
@@ -449,14 +565,17 @@ class Signal(object):
         return self.name
 
 
-@attr.s(cmp=False)
+@attr.s(cmp=False, slots=True)
 class SignalGroup(object):
     """
     Represents signal-group, containing multiple Signals.
     """
     name = attr.ib()  # type: str
     id = attr.ib()  # type: int
-    signals = attr.ib(factory=list, repr=False)  # type: typing.MutableSequence[Signal]
+    _signals = attr.ib(default=None, repr=False)  # type: typing.Optional[typing.MutableSequence[Signal]]
+
+    lazy_fields = ("signals",)
+    signals = lazy_container("signals", list)  # type: typing.MutableSequence[Signal]
 
     def add_signal(self, signal):  # type: (Signal) -> None
         """Add a Signal to SignalGroup.
@@ -587,6 +706,95 @@ def pack_bitstring(length, is_float, value, signed):
     return bitstring
 
 
+def signal_layout(signal):
+    # type: (Signal) -> typing.Tuple[int, int, bool, bool, bool]
+    """Return the attributes of a signal which define where and how its raw value is stored in a frame."""
+    return signal.start_bit, signal.size, signal.is_little_endian, signal.is_signed, signal.is_float
+
+
+@attr.s(cmp=False)
+class FrameCodec(object):
+    """
+    Compiled integer shift/mask plan of a frame layout.
+
+    The payload is read as one integer in little and one in big byte order, every signal
+    is a shift and mask of one of them. Used by Frame.unpack and Frame.signals_to_bytes instead of
+    the bit string functions.
+    A codec with plans None marks a layout the plans cannot express (signals out of the frame,
+    zero length or float signals which are not 32/64 bit long), those frames use the bit strings.
+    """
+
+    size = attr.ib()  # type: int
+    layouts = attr.ib()  # type: typing.Sequence[typing.Tuple[Signal, typing.Tuple[int, int, bool, bool, bool]]]
+    plans = attr.ib(default=None)  # type: typing.Optional[typing.Sequence[typing.Tuple]]
+
+    float_formats = {32: ('>I', '>f'), 64: ('>Q', '>d')}
+
+    @classmethod
+    def compile(cls, frame):  # type: (Frame) -> FrameCodec
+        layouts = [(signal, signal_layout(signal)) for signal in frame.signals]
+        codec = cls(frame.size, layouts)
+        bit_count = frame.size * 8
+        plans = []
+        for signal, (start_bit, size, is_little_endian, is_signed, is_float) in layouts:
+            if size <= 0 or start_bit < 0 or start_bit + size > bit_count:
+                return codec
+            if is_float and size not in cls.float_formats:
+                return codec
+            shift = start_bit if is_little_endian else bit_count - start_bit - size
+            sign_bit = 1 << (size - 1) if is_signed and not is_float else 0
+            float_format = cls.float_formats[size] if is_float else None
+            plans.append((signal, is_little_endian, shift, (1 << size) - 1, size, sign_bit, float_format))
+        codec.plans = plans
+        return codec
+
+    def matches(self, frame):  # type: (Frame) -> bool
+        """Check the codec was compiled for the current signals and size of the frame."""
+        if self.size != frame.size or len(self.layouts) != len(frame.signals):
+            return False
+        for (compiled_signal, layout), signal in zip(self.layouts, frame.signals):
+            if compiled_signal is not signal or layout != signal_layout(signal):
+                return False
+        return True
+
+    def unpack(self, data):
+        # type: (bytes) -> typing.List[typing.Tuple[Signal, canmatrix.types.RawValue]]
+        little = int.from_bytes(data, 'little')
+        big = int.from_bytes(data, 'big')
+        unpacked = []
+        for signal, is_little_endian, shift, mask, size, sign_bit, float_format in self.plans:
+            value = ((little if is_little_endian else big) >> shift) & mask
+            if float_format is not None:
+                value, = struct.unpack(float_format[1], struct.pack(float_format[0], value))
+            elif value & sign_bit:
+                value -= 1 << size
+            unpacked.append((signal, value))
+        return unpacked
+
+    def pack(self, data):
+        # type: (typing.Mapping[str, canmatrix.types.RawValue]) -> bytearray
+        little = little_used = big = big_used = 0
+        for signal, is_little_endian, shift, mask, size, sign_bit, float_format in self.plans:
+            if signal.name not in data:
+                continue
+            value = data.get(signal.name)
+            if float_format is not None:
+                raw, = struct.unpack(float_format[0], struct.pack(float_format[1], value))
+            else:
+                raw = int((2 << size) + value) & mask
+            bits = mask << shift
+            if is_little_endian:
+                little = (little & ~bits) | (raw << shift)
+                little_used |= bits
+            else:
+                big = (big & ~bits) | (raw << shift)
+                big_used |= bits
+        # bits of little endian signals take precedence over big endian ones, unused bits are 0
+        little = int.from_bytes(little.to_bytes(self.size, 'little'), 'big')
+        little_used = int.from_bytes(little_used.to_bytes(self.size, 'little'), 'big')
+        return bytearray((little | (big & ~little_used)).to_bytes(self.size, 'big'))
+
+
 @attr.s(cmp=False)
 class ArbitrationId(object):
     standard_id_mask = ((1 << 11) - 1)
@@ -728,7 +936,25 @@ class ArbitrationId(object):
             )
         )
 
-@attr.s(cmp=False)
+def build_signal_name_index(signals):  # type: (typing.Sequence[Signal]) -> typing.Dict[str, Signal]
+    """Map every signal name to the first signal with this name."""
+    index = {}  # type: typing.Dict[str, Signal]
+    for signal in signals:
+        index.setdefault(signal.name, signal)
+    return index
+
+
+def build_signal_group_index(signal_groups):
+    # type: (typing.Sequence[SignalGroup]) -> typing.Dict[str, SignalGroup]
+    """Map every signal name to the first group containing it."""
+    index = {}  # type: typing.Dict[str, SignalGroup]
+    for group in signal_groups:
+        for signal in group.signals:
+            index.setdefault(str(signal), group)
+    return index
+
+
+@attr.s(cmp=False, slots=True)
 class Pdu(object):
     """
     Represents a PDU.
@@ -744,8 +970,26 @@ class Pdu(object):
     triggering_name = attr.ib(default="")  # type: str
     pdu_type = attr.ib(default="")  # type: str
     port_type = attr.ib(default="")  # type: str
-    signals = attr.ib(factory=list)  # type: typing.MutableSequence[Signal]
-    signalGroups = attr.ib(factory=list)  # type: typing.MutableSequence[SignalGroup]
+    _signals = attr.ib(default=None)  # type: typing.Optional[typing.MutableSequence[Signal]]
+    _signalGroups = attr.ib(default=None)  # type: typing.Optional[typing.MutableSequence[SignalGroup]]
+
+    # signal name -> group, see get_signal_group_for_signal. Kept up to date by add_signal_group,
+    # rebuilt if built for another number of groups (-1: stale)
+    _signal_group_index = attr.ib(default=None, init=False, repr=False)  # type: typing.Optional[typing.Dict[str, SignalGroup]]
+    _indexed_group_count = attr.ib(default=-1, init=False, repr=False)  # type: int
+    # signal name index, kept up to date by add_signal/del_signal/rename_signal,
+    # rebuilt if built for another number of signals
+    _signals_by_name = attr.ib(default=None, init=False, repr=False)  # type: typing.Optional[typing.Dict[str, Signal]]
+    _indexed_signal_count = attr.ib(default=-1, init=False, repr=False)  # type: int
+
+    # containers allocated on first access, created empty if not given
+    lazy_fields = ("signals", "signalGroups")
+    signals = lazy_container("signals", list)  # type: typing.MutableSequence[Signal]
+    signalGroups = lazy_container("signalGroups", list)  # type: typing.MutableSequence[SignalGroup]
+
+    def _rebuild_signal_index(self):  # type: () -> None
+        self._signals_by_name = build_signal_name_index(self.signals)
+        self._indexed_signal_count = len(self.signals)
 
     def add_signal(self, signal):
         # type: (Signal) -> Signal
@@ -755,8 +999,36 @@ class Pdu(object):
         :param Signal signal: Signal to be added.
         :return: the signal added.
         """
+        if self._indexed_signal_count != len(self.signals):
+            self._rebuild_signal_index()
         self.signals.append(signal)
+        self._signals_by_name.setdefault(signal.name, signal)
+        self._indexed_signal_count += 1
         return self.signals[len(self.signals) - 1]
+
+    def del_signal(self, signal):
+        # type: (Signal) -> None
+        """
+        Remove Signal from Pdu.
+
+        :param Signal signal: Signal to be removed.
+        """
+        self.signals.remove(signal)
+        self._rebuild_signal_index()
+
+    def rename_signal(self, signal, new_name):
+        # type: (Signal, str) -> None
+        """
+        Rename a Signal of the Pdu.
+
+        Use Frame.rename_signal for signals of a frame, it also updates the pdus of the frame.
+
+        :param Signal signal: Signal to be renamed.
+        :param str new_name: new name
+        """
+        signal.name = new_name
+        self._rebuild_signal_index()
+
     def add_signal_group(self, Name, Id, signalNames):
         # type: (str, int, typing.Sequence[str]) -> None
         """Add new SignalGroup to the Frame. Add given signals to the group.
@@ -766,45 +1038,44 @@ class Pdu(object):
         :param list of str signalNames: list of Signal names to add. Non existing names are ignored.
         """
         newGroup = SignalGroup(Name, Id)
-        #logger.debug("01 in PDU add_signal_group function,signalGroup "+str(newGroup)+" is added.")        
-        #self.signalGroups.append(newGroup)                
         for signal in signalNames:
             signal = signal.strip()
-            #logger.debug("02 in PDU add_signal_group function,signal name  is "+str(signal))
             if signal.__len__() == 0:
                 continue
             signalId = self.signal_by_name(signal)
             if signalId is not None:
                 newGroup.add_signal(signal)
             else:
-                logger.debug("03 in PDU add_signal_group function,signal ID not found: "+str(signal))    
-        self.signalGroups.append(newGroup)
-        #logger.debug("04 in PDU add_signal_group function,signalGroups last one now is "+str(self.signalGroups)) 
+                logger.debug("in PDU add_signal_group function, signal ID not found: %s", signal)
+        self._add_signal_group(newGroup)
+
+    def _add_signal_group(self, group):  # type: (SignalGroup) -> None
+        if self._indexed_group_count == len(self.signalGroups):
+            for signal in group.signals:
+                self._signal_group_index.setdefault(str(signal), group)
+            self._indexed_group_count += 1
+        else:
+            self._indexed_group_count = -1
+        self.signalGroups.append(group)
 
     def get_signal_group_for_signal(self, signal_to_find):
-        logger.debug("01 in PDU get_signal_group_for_signal function, start find signalgroup with signal "+str(signal_to_find))
-        if self.signalGroups is None:
-            logger.debug("02 self.signalGroups is none")
-        logger.debug("03 in PDU get_signal_group_for_signal function, self.signalGroups[0] is "+ str(self.signalGroups))
-        for signal_group in self.signalGroups:
-            #logger.debug("04 in PDU get_signal_group_for_signal function, current signal list is "+str(signal_group.signals))
-            for signal in signal_group.signals:
-                #logger.debug("05 in PDU get_signal_group_for_signal function, current searchingSignalName is "+str(signal))
-                inputSignalName = str(signal_to_find)
-                searchingSignalName = str(signal)
-                #logger.debug("06 in PDU get_signal_group_for_signal function,inputSignalName is "+inputSignalName)
-                if inputSignalName == searchingSignalName:
-                    #logger.debug("07 in PDU get_signal_group_for_signal function, found signal group"+ str(signal_group.signals)+"with signal "+str(signal_to_find))
-                    return signal_group
-                if signal is None:
-                    logger.debug("08 in PDU get_signal_group_for_signal function,signal is none in signal group.")    
-            if signal_group is None:
-                signal_group = self.signal_by_name(signal_to_find)
-                #logger.debug("09 in PDU get_signal_group_for_signal function,signal_group is not exist for signal "+signal_to_find)                   
-            if signal_group is []:
-                logger.debug("10 in PDU get_signal_group_for_signal function,signal_group is empty")
-                pass 
-        return None
+        # type: (typing.Any) -> typing.Optional[SignalGroup]
+        """Get the first signal group containing the signal name str(signal_to_find).
+
+        Members added to a group after add_signal_group are not indexed, call invalidate_signal_group_index
+        after changing groups directly.
+
+        :param signal_to_find: signal name or Signal
+        :return: SignalGroup or None
+        """
+        if self._indexed_group_count != len(self.signalGroups):
+            self._signal_group_index = build_signal_group_index(self.signalGroups)
+            self._indexed_group_count = len(self.signalGroups)
+        return self._signal_group_index.get(str(signal_to_find))
+
+    def invalidate_signal_group_index(self):  # type: () -> None
+        """Rebuild the signal group index on the next lookup."""
+        self._indexed_group_count = -1
 
     def signal_by_name(self, name):
         # type: (str) -> typing.Union[Signal, None]
@@ -814,13 +1085,12 @@ class Pdu(object):
         :param str name: signal name to be found.
         :return: signal with given name or None if not found
         """
-        for signal in self.signals:
-            if signal.name == name:
-                return signal
-        return None
+        if self._indexed_signal_count != len(self.signals):
+            self._rebuild_signal_index()
+        return self._signals_by_name.get(name)
 
 
-@attr.s(cmp=False)
+@attr.s(cmp=False, slots=True)
 class Frame(object):
     """
     Represents CAN Frame.
@@ -839,22 +1109,26 @@ class Frame(object):
     and any *custom* attributes in `attributes` dict.
 
     Frame signals can be accessed using the iterator.
+
+    A CanMatrix indexes its frames by name and arbitration id. Use CanMatrix.rename_frame, or call
+    CanMatrix.invalidate_frame_index after changing name or arbitration_id of an added frame directly,
+    else the frame is not found under its new name or id.
     """
 
     name = attr.ib(default="")  # type: str
     # mypy Unsupported converter:
     arbitration_id = attr.ib(converter=arbitration_id_converter, default=0)  # type: ArbitrationId
     size = attr.ib(default=0)  # type: int
-    transmitters = attr.ib(factory=list)  # type: typing.MutableSequence[str]
+    _transmitters = attr.ib(default=None)  # type: typing.Optional[typing.MutableSequence[str]]
     # extended = attr.ib(default=False)  # type: bool
     is_complex_multiplexed = attr.ib(default=False)  # type: bool
     is_fd = attr.ib(default=False)  # type: bool
     comment = attr.ib(default="")  # type: str
-    signals = attr.ib(factory=list)  # type: typing.MutableSequence[Signal]
-    mux_names = attr.ib(factory=dict)  # type: typing.MutableMapping[int, str]
-    attributes = attr.ib(factory=dict)  # type: typing.MutableMapping[str, typing.Any]
-    receivers = attr.ib(factory=list)  # type: typing.MutableSequence[str]
-    signalGroups = attr.ib(factory=list)  # type: typing.MutableSequence[SignalGroup]
+    _signals = attr.ib(default=None)  # type: typing.Optional[typing.MutableSequence[Signal]]
+    _mux_names = attr.ib(default=None)  # type: typing.Optional[typing.MutableMapping[int, str]]
+    _attributes = attr.ib(default=None)  # type: typing.Optional[typing.MutableMapping[str, typing.Any]]
+    _receivers = attr.ib(default=None)  # type: typing.Optional[typing.MutableSequence[str]]
+    _signalGroups = attr.ib(default=None)  # type: typing.Optional[typing.MutableSequence[SignalGroup]]
     slot_id = attr.ib(default="")
     base_cycle = attr.ib(default="")
     repitition_cycle = attr.ib(default="")
@@ -866,8 +1140,28 @@ class Frame(object):
     # ('cycleTime', '_cycleTime', int, None),
     # ('sendType', '_sendType', str, None),
 
-    pdus = attr.ib(factory=list)  # type: typing.MutableSequence[Pdu]
-
+    _pdus = attr.ib(default=None)  # type: typing.Optional[typing.MutableSequence[Pdu]]
+
+    # compiled codec of the signal layout, recompiled by get_codec when signals or size changed
+    _codec = attr.ib(default=None, init=False, repr=False)  # type: typing.Optional[FrameCodec]
+    # signal name -> group, see get_signal_group_for_signal. Kept up to date by add_signal_group,
+    # rebuilt if built for another number of groups (-1: stale)
+    _signal_group_index = attr.ib(default=None, init=False, repr=False)  # type: typing.Optional[typing.Dict[str, SignalGroup]]
+    _indexed_group_count = attr.ib(default=-1, init=False, repr=False)  # type: int
+    # signal name index, kept up to date by add_signal/del_signal/rename_signal,
+    # rebuilt if built for another number of signals
+    _signals_by_name = attr.ib(default=None, init=False, repr=False)  # type: typing.Optional[typing.Dict[str, Signal]]
+    _indexed_signal_count = attr.ib(default=-1, init=False, repr=False)  # type: int
+
+    # containers allocated on first access, created empty if not given
+    lazy_fields = ("transmitters", "signals", "mux_names", "attributes", "receivers", "signalGroups", "pdus")
+    transmitters = lazy_container("transmitters", list)  # type: typing.MutableSequence[str]
+    signals = lazy_container("signals", list)  # type: typing.MutableSequence[Signal]
+    mux_names = lazy_container("mux_names", dict)  # type: typing.MutableMapping[int, str]
+    attributes = lazy_container("attributes", dict)  # type: typing.MutableMapping[str, typing.Any]
+    receivers = lazy_container("receivers", list)  # type: typing.MutableSequence[str]
+    signalGroups = lazy_container("signalGroups", list)  # type: typing.MutableSequence[SignalGroup]
+    pdus = lazy_container("pdus", list)  # type: typing.MutableSequence[Pdu]
 
     @property
     def is_multiplexed(self):  # type: () -> bool
@@ -973,7 +1267,7 @@ class Frame(object):
         :param default: Default value if attribute doesn't exist.
         :return: Return the attribute value if found, else `default` or None
         """
-        if attribute_name in attr.fields_dict(type(self)):
+        if attribute_name in attr.fields_dict(type(self)) or attribute_name in self.lazy_fields:
             return getattr(self, attribute_name)
         if attribute_name in self.attributes:
             return self.attributes[attribute_name]
@@ -996,18 +1290,22 @@ class Frame(object):
         :param list of str signalNames: list of Signal names to add. Non existing names are ignored.
         """
         newGroup = SignalGroup(Name, Id)
-        logger.debug("in Frame add_signal_group function,signalGroup "+str(newGroup)+" is added.")
-        
-        #self.signalGroups.append(newGroup)
-        #logger.debug("in Frame add_signal_group function,signalGroups last one now is "+str(self.signalGroups))
+        logger.debug("in Frame add_signal_group function, signalGroup %s is added.", newGroup)
         for signal in signalNames:
             signal = signal.strip()
             if signal.__len__() == 0:
                 continue
-            #signalId = self.signal_by_name(signal)
-            #if signalId is not None:
             newGroup.add_signal(signal)
-        self.signalGroups.append(newGroup)        
+        self._add_signal_group(newGroup)
+
+    def _add_signal_group(self, group):  # type: (SignalGroup) -> None
+        if self._indexed_group_count == len(self.signalGroups):
+            for signal in group.signals:
+                self._signal_group_index.setdefault(str(signal), group)
+            self._indexed_group_count += 1
+        else:
+            self._indexed_group_count = -1
+        self.signalGroups.append(group)
 
     def signal_group_by_name(self, name):
         # type: (str) -> typing.Union[SignalGroup, None]
@@ -1042,31 +1340,60 @@ class Frame(object):
         :param Signal signal: Signal to be added.
         :return: the signal added.
         """
+        if self._indexed_signal_count != len(self.signals):
+            self._rebuild_signal_index()
         self.signals.append(signal)
+        self._signals_by_name.setdefault(signal.name, signal)
+        self._indexed_signal_count += 1
         return self.signals[len(self.signals) - 1]
 
+    def _rebuild_signal_index(self):  # type: () -> None
+        self._signals_by_name = build_signal_name_index(self.signals)
+        self._indexed_signal_count = len(self.signals)
+
+    def del_signal(self, signal):
+        # type: (Signal) -> None
+        """
+        Remove Signal from Frame.
+
+        :param Signal signal: Signal to be removed.
+        """
+        self.signals.remove(signal)
+        self._rebuild_signal_index()
+
+    def rename_signal(self, signal, new_name):
+        # type: (Signal, str) -> None
+        """
+        Rename a Signal of the Frame and of its pdus.
+
+        :param Signal signal: Signal to be renamed.
+        :param str new_name: new name
+        """
+        signal.name = new_name
+        self._rebuild_signal_index()
+        for pdu in self.pdus:
+            if any(pdu_signal is signal for pdu_signal in pdu.signals):
+                pdu.rename_signal(signal, new_name)
+
     '''used as frame.add_signal_group(group_name, group_id, members) in arxml'''
     def get_signal_group_for_signal(self, signal_to_find):
-        logger.debug("01 in frame get_signal_group_for_signal function, start find signalgroup with signal "+str(signal_to_find))
-        if self.signalGroups is None:
-            logger.debug("02 self.signalGroups is none")
-        #logger.debug("03 self.signalGroups[0] is "+ str(self.signalGroups))
-        for signal_group in self.signalGroups:
-            #logger.debug("04 in frame get_signal_group_for_signal function, current signal list is "+str(signal_group.signals))
-            for signal in signal_group.signals:
-                #logger.debug("05 in frame get_signal_group_for_signal function, current signal is "+str(signal))
-                inputSignalName = str(signal)
-                searchingSignalName = str(signal_to_find)
-                if inputSignalName == searchingSignalName  :
-                    #logger.debug("06 in frame get_signal_group_for_signal function, found signal group"+ str(signal_group.signals)+"with signal "+str(signal_to_find))
-                    return signal_group
-                if signal is None:
-                    logger.debug("07 in frame get_signal_group_for_signal function,signal is none in signal group"+ str(self.signalGroups))    
-            if signal_group is None:
-                logger.debug("08 in frame get_signal_group_for_signal function,signal_group is none")                   
-            if signal_group is []:
-                logger.debug("09 in frame get_signal_group_for_signal function,signal_group is empty") 
-        return None
+        # type: (typing.Any) -> typing.Optional[SignalGroup]
+        """Get the first signal group containing the signal name str(signal_to_find).
+
+        Members added to a group after add_signal_group are not indexed, call invalidate_signal_group_index
+        after changing groups directly.
+
+        :param signal_to_find: signal name or Signal
+        :return: SignalGroup or None
+        """
+        if self._indexed_group_count != len(self.signalGroups):
+            self._signal_group_index = build_signal_group_index(self.signalGroups)
+            self._indexed_group_count = len(self.signalGroups)
+        return self._signal_group_index.get(str(signal_to_find))
+
+    def invalidate_signal_group_index(self):  # type: () -> None
+        """Rebuild the signal group index on the next lookup."""
+        self._indexed_group_count = -1
 
     def add_transmitter(self, transmitter):
         # type: (str) -> None
@@ -1103,10 +1430,9 @@ class Frame(object):
         :param str name: signal name to be found.
         :return: signal with given name or None if not found
         """
-        for signal in self.signals:
-            if signal.name == name:
-                return signal
-        return None
+        if self._indexed_signal_count != len(self.signals):
+            self._rebuild_signal_index()
+        return self._signals_by_name.get(name)
 
     def glob_signals(self, glob_str):
         # type: (str) -> typing.Sequence[Signal]
@@ -1254,6 +1580,10 @@ class Frame(object):
         :return: A byte string of the packed values.
         """
 
+        codec = self.get_codec()
+        if codec.plans is not None:
+            return codec.pack(data)
+
         little_bits = [None] * (self.size * 8)  # type: typing.List[typing.Optional[str]]
         big_bits = list(little_bits)
         for signal in self.signals:
@@ -1283,6 +1613,16 @@ class Frame(object):
             for b in grouper(bitstring, 8)
         )
 
+    def get_codec(self):
+        # type: () -> FrameCodec
+        """Return the compiled codec of the frame, it is recompiled if the signals or the size changed.
+
+        :return: FrameCodec of the current signal layout
+        """
+        if self._codec is None or not self._codec.matches(self):
+            self._codec = FrameCodec.compile(self)
+        return self._codec
+
     def encode(self, data=None):
         # type: (typing.Optional[typing.Mapping[str, typing.Any]]) -> bytes
         """Return a byte string containing the values from data packed
@@ -1375,6 +1715,10 @@ class Frame(object):
                 'Received message 0x{self.arbitration_id.id:08X} with length {rx_length}, expected {self.size}'.format(**locals()))
             raise DecodingFrameLength
         else:
+            codec = self.get_codec()
+            if rx_length == self.size and codec.plans is not None:
+                return {s.name: DecodedSignal(v, s) for s, v in codec.unpack(data)}
+
             little, big = self.bytes_to_bitstrings(data)
 
             unpacked = self.bitstring_to_signal_list(self.signals, big, little)
@@ -1592,10 +1936,66 @@ class CanMatrix(object):
 
     load_errors = attr.ib(factory=list)  # type: typing.MutableSequence[Exception]
 
+    # lookup indexes of frames and ecus, kept up to date by the add/remove/rename methods.
+    # An index built for another number of frames/ecus (or -1, marked stale) is rebuilt on the next lookup.
+    _frames_by_name = attr.ib(factory=dict, init=False, repr=False)  # type: typing.MutableMapping[str, Frame]
+    _frames_by_id = attr.ib(factory=dict, init=False, repr=False)  # type: typing.MutableMapping[int, typing.List[Frame]]
+    _frames_by_pgn = attr.ib(factory=dict, init=False, repr=False)  # type: typing.MutableMapping[int, typing.List[Frame]]
+    _indexed_frame_count = attr.ib(default=-1, init=False, repr=False)  # type: int
+    _ecus_by_name = attr.ib(factory=dict, init=False, repr=False)  # type: typing.MutableMapping[str, Ecu]
+    _ecus_by_stripped_name = attr.ib(factory=dict, init=False, repr=False)  # type: typing.MutableMapping[str, Ecu]
+    _indexed_ecu_count = attr.ib(default=-1, init=False, repr=False)  # type: int
+
     def __iter__(self):  # type: () -> typing.Iterator[Frame]
         """Matrix iterates over Frames (Messages)."""
         return iter(self.frames)
 
+    def _index_frame(self, frame):  # type: (Frame) -> None
+        self._frames_by_name.setdefault(frame.name, frame)
+        self._frames_by_id.setdefault(frame.arbitration_id.id, []).append(frame)
+        if frame.arbitration_id.extended:
+            self._frames_by_pgn.setdefault(frame.arbitration_id.pgn, []).append(frame)
+
+    def _rebuild_frame_index(self):  # type: () -> None
+        """Rebuild the frame indexes used by frame_by_name, frame_by_id and frame_by_pgn."""
+        self._frames_by_name = {}
+        self._frames_by_id = {}
+        self._frames_by_pgn = {}
+        for frame in self.frames:
+            self._index_frame(frame)
+        self._indexed_frame_count = len(self.frames)
+
+    def _check_frame_index(self):  # type: () -> None
+        if self._indexed_frame_count != len(self.frames):
+            self._rebuild_frame_index()
+
+    def invalidate_frame_index(self):  # type: () -> None
+        """Rebuild the frame lookup indexes on the next lookup.
+
+        Call after changing names or arbitration ids of frames of the matrix directly.
+        """
+        self._indexed_frame_count = -1
+
+    def _index_ecu(self, ecu):  # type: (Ecu) -> None
+        self._ecus_by_name.setdefault(ecu.name, ecu)
+        self._ecus_by_stripped_name.setdefault(ecu.name.strip(), ecu)
+
+    def _rebuild_ecu_index(self):  # type: () -> None
+        """Rebuild the ECU indexes used by ecu_by_name and add_ecu."""
+        self._ecus_by_name = {}
+        self._ecus_by_stripped_name = {}
+        for ecu in self.ecus:
+            self._index_ecu(ecu)
+        self._indexed_ecu_count = len(self.ecus)
+
+    def _check_ecu_index(self):  # type: () -> None
+        if self._indexed_ecu_count != len(self.ecus):
+            self._rebuild_ecu_index()
+
+    def invalidate_ecu_index(self):  # type: () -> None
+        """Rebuild the ECU lookup indexes on the next lookup, call after renaming ECUs directly."""
+        self._indexed_ecu_count = -1
+
     def add_env_var(self, name, envVarDict):  # type: (str, typing.MutableMapping) -> None
         self.env_vars[name] = envVarDict
 
@@ -1753,7 +2153,13 @@ class CanMatrix(object):
         :param ArbitrationId arbitration_id: Frame id as canmatrix.ArbitrationId
         :rtype: Frame or None
         """
-        for test in self.frames:
+        self._check_frame_index()
+        frames = self._frames_by_id.get(arbitration_id.id, [])
+        if any(test.arbitration_id.id != arbitration_id.id for test in frames):
+            # an indexed frame got another id directly, see invalidate_frame_index
+            self._rebuild_frame_index()
+            frames = self._frames_by_id.get(arbitration_id.id, [])
+        for test in frames:
             if test.arbitration_id == arbitration_id:
                 # found ID while ignoring extended or standard
                 return test
@@ -1765,13 +2171,17 @@ class CanMatrix(object):
         :param int pgn: pgn to search for
         :rtype: Frame or None
         """
-
-        for test in self.frames:
-            if test.arbitration_id.pgn == canmatrix.ArbitrationId.from_pgn(pgn).pgn:
-                # canmatrix.ArbitrationId.from_pgn(pgn).pgn instead
-                # of just pgn is needed to do the pf >= 240 check
-                return test
-        return None
+        # canmatrix.ArbitrationId.from_pgn(pgn).pgn instead
+        # of just pgn is needed to do the pf >= 240 check
+        search_pgn = canmatrix.ArbitrationId.from_pgn(pgn).pgn
+        self._check_frame_index()
+        # only extended ids have a pgn, the index holds the extended frames
+        frames = self._frames_by_pgn.get(search_pgn)
+        if frames and not (frames[0].arbitration_id.extended and frames[0].arbitration_id.pgn == search_pgn):
+            # the frame got another id directly, see invalidate_frame_index
+            self._rebuild_frame_index()
+            frames = self._frames_by_pgn.get(search_pgn)
+        return frames[0] if frames else None
 
 
     def frame_by_name(self, name):  # type: (str) -> typing.Union[Frame, None]
@@ -1780,10 +2190,13 @@ class CanMatrix(object):
         :param str name: Frame name to search for
         :rtype: Frame or None
         """
-        for test in self.frames:
-            if test.name == name:
-                return test
-        return None
+        self._check_frame_index()
+        test = self._frames_by_name.get(name)
+        if test is not None and test.name != name:
+            # the frame was renamed directly, see invalidate_frame_index
+            self._rebuild_frame_index()
+            test = self._frames_by_name.get(name)
+        return test
 
     def glob_frames(self, globStr):  # type: (str) -> typing.List[Frame]
         """Find Frames by given glob pattern.
@@ -1804,10 +2217,13 @@ class CanMatrix(object):
         :param str name: BoardUnit name
         :rtype: Ecu or None
         """
-        for test in self.ecus:
-            if test.name == name:
-                return test
-        return None
+        self._check_ecu_index()
+        test = self._ecus_by_name.get(name)
+        if test is not None and test.name != name:
+            # the ECU was renamed directly, see invalidate_ecu_index
+            self._rebuild_ecu_index()
+            test = self._ecus_by_name.get(name)
+        return test
 
     def glob_ecus(self, globStr):  # type: (str) -> typing.List[Ecu]
         """
@@ -1825,10 +2241,16 @@ class CanMatrix(object):
     def add_frame(self, frame):  # type: (Frame) -> Frame
         """Add the Frame to the Matrix.
 
+        The frame is indexed by its current name and arbitration id. After changing them directly, call
+        invalidate_frame_index, or use rename_frame for the name.
+
         :param Frame frame: Frame to add
         :return: the inserted Frame
         """
+        self._check_frame_index()
         self.frames.append(frame)
+        self._index_frame(frame)
+        self._indexed_frame_count += 1
         return self.frames[len(self.frames) - 1]
 
     def remove_frame(self, frame):  # type: (Frame) -> None
@@ -1837,6 +2259,7 @@ class CanMatrix(object):
         :param Frame frame: frame to remove from CAN Matrix
         """
         self.frames.remove(frame)
+        self._indexed_frame_count = -1
 
     def add_signal(self, signal):  # type: (Signal) -> Signal
         """
@@ -1860,7 +2283,7 @@ class CanMatrix(object):
         for frame in self.frames:
             for signal in frame.signals:
                 if 0 == signal.size:
-                    frame.signals.remove(signal)
+                    frame.del_signal(signal)
 
     def del_signal_attributes(self, unwanted_attributes):  # type: (typing.Sequence[str]) -> None
         """Delete Signal attributes from all Signals of all Frames.
@@ -1907,6 +2330,7 @@ class CanMatrix(object):
             return
         old_name = ecu.name
         ecu.name = new_name
+        self._indexed_ecu_count = -1
         for frame in self.frames:
             if old_name in frame.transmitters:
                 frame.transmitters.remove(old_name)
@@ -1922,10 +2346,12 @@ class CanMatrix(object):
 
         :param Ecu ecu: ECU name to add
         """
-        for bu in self.ecus:
-            if bu.name.strip() == ecu.name:
-                return
+        self._check_ecu_index()
+        if ecu.name in self._ecus_by_stripped_name:
+            return
         self.ecus.append(ecu)
+        self._index_ecu(ecu)
+        self._indexed_ecu_count += 1
 
     def del_ecu(self, ecu_or_glob):  # type: (typing.Union[Ecu, str]) -> None
         """Remove ECU from Matrix and all Frames.
@@ -1937,6 +2363,7 @@ class CanMatrix(object):
         for ecu in ecu_list:
             if ecu in self.ecus:
                 self.ecus.remove(ecu)
+                self._indexed_ecu_count = -1
                 for frame in self.frames:
                     frame.del_transmitter(ecu.name)
                     for signal in frame.signals:
@@ -1972,6 +2399,7 @@ class CanMatrix(object):
                     frame.name = frame.name[:-old_suffix_len] + new_name
             elif frame.name == old_name:
                 frame.name = new_name
+        self._indexed_frame_count = -1
 
     def del_frame(self, frame_or_name):  # type: (typing.Union[Frame, str]) -> None
         """Delete Frame from Matrix.
@@ -1980,6 +2408,7 @@ class CanMatrix(object):
         frame = frame_or_name if isinstance(frame_or_name, Frame) else self.frame_by_name(frame_or_name)
         if frame:
             self.frames.remove(frame)
+            self._indexed_frame_count = -1
 
     def rename_signal(self, signal_or_name, new_name):  # type: (typing.Union[Signal, str], str) -> None
         """Rename Signal.
@@ -1993,16 +2422,16 @@ class CanMatrix(object):
                 old_prefix_len = len(old_name) - 1
                 for signal in frame.signals:
                     if signal.name[:old_prefix_len] == old_name[:-1]:
-                        signal.name = new_name + signal.name[old_prefix_len:]
+                        frame.rename_signal(signal, new_name + signal.name[old_prefix_len:])
             elif old_name[0] == '*':
                 old_suffix_len = len(old_name) - 1
                 for signal in frame.signals:
                     if signal.name[-old_suffix_len:] == old_name[1:]:
-                        signal.name = signal.name[:-old_suffix_len] + new_name
+                        frame.rename_signal(signal, signal.name[:-old_suffix_len] + new_name)
             else:
                 signal_found = frame.signal_by_name(old_name)
                 if signal_found:
-                    signal_found.name = new_name
+                    frame.rename_signal(signal_found, new_name)
 
     def del_signal(self, signal):  # type: (typing.Union[Signal, str]) -> None
         """Delete Signal from Matrix and all Frames.
@@ -2011,12 +2440,12 @@ class CanMatrix(object):
         if isinstance(signal, Signal):
             for frame in self.frames:
                 if signal in frame.signals:
-                    frame.signals.remove(signal)
+                    frame.del_signal(signal)
         else:
             for frame in self.frames:
                 signal_list = frame.glob_signals(signal)
                 for sig in signal_list:
-                    frame.signals.remove(sig)
+                    frame.del_signal(sig)
 
     def add_signal_receiver(self, globFrame, globSignal, ecu):  # type: (str, str, str) -> None
         """Add Receiver to all Frames and Signals by glob pattern.
@@ -2138,6 +2567,50 @@ class CanMatrix(object):
         else:
             return {}
 
+    def set_numeric_mode(self, numeric_mode):  # type: (str) -> None
+        """Set the numeric mode of the physical conversion for all signals.
+
+        :param str numeric_mode: "decimal" (exact, default), "float" or "fraction"
+        """
+        if numeric_mode not in numeric_factories:
+            raise ValueError("unknown numeric mode {}".format(numeric_mode))
+        for frame in self.frames:
+            for signal in frame.signals:
+                signal.numeric_mode = numeric_mode
+            for pdu in frame.pdus:
+                for signal in pdu.signals:
+                    signal.numeric_mode = numeric_mode
+        for signal in self.signals:
+            signal.numeric_mode = numeric_mode
+
+    def signal_columns(self):  # type: () -> typing.Any
+        """Build a columnar view of all signals, see canmatrix.columns.build_signal_columns.
+
+        :return: canmatrix.columns.SignalColumns with the signal attributes as arrays
+        """
+        import canmatrix.columns
+        return canmatrix.columns.build_signal_columns(self)
+
+    def fingerprint(self):  # type: () -> str
+        """Content fingerprint of the matrix, see canmatrix.fingerprint.fingerprint.
+
+        :return: sha1 hex string, equal for matrices of equal content
+        """
+        import canmatrix.fingerprint
+        return canmatrix.fingerprint.fingerprint(self)
+
+    def decode_batch(self, arbitration_ids, payloads, extended=None):
+        # type: (typing.Any, typing.Any, typing.Any) -> typing.Mapping[str, typing.Any]
+        """Decode many received frames at once, needs numpy. See canmatrix.batch.decode_batch.
+
+        :param arbitration_ids: array of N arbitration ids
+        :param payloads: uint8 matrix of shape (N, 64), one payload per row
+        :param extended: optional array of N booleans, extended flag of each id
+        :return: frame name -> canmatrix.batch.DecodedBatch with column arrays of raw and physical values
+        """
+        import canmatrix.batch
+        return canmatrix.batch.decode_batch(self, arbitration_ids, payloads, extended)
+
     def enum_attribs_to_values(self):  # type: () -> None
         for define in self.ecu_defines:
             if self.ecu_defines[define].type == "ENUM":
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+Columnar (struct of arrays) view of the signals of a CanMatrix.
+
+The view is built once from the object graph: one row per signal, the signals of a frame are
+stored in consecutive rows. Numeric attributes are contiguous arrays, names are stored once in
+a name table and referenced by index.
+"""
+from __future__ import absolute_import, division, print_function
+
+import array
+import typing
+from builtins import *
+
+import attr
+
+import canmatrix
+
+
+@attr.s(cmp=False)
+class NameTable(object):
+    """Interned strings, every distinct name is stored once and referenced by its index."""
+
+    names = attr.ib(factory=list)  # type: typing.List[str]
+    index = attr.ib(factory=dict)  # type: typing.Dict[str, int]
+
+    def add(self, name):  # type: (str) -> int
+        """Return the index of name, name is added if not in the table yet."""
+        position = self.index.get(name)
+        if position is None:
+            position = self.index[name] = len(self.names)
+            self.names.append(name)
+        return position
+
+    def __getitem__(self, position):  # type: (int) -> str
+        return self.names[position]
+
+    def __len__(self):  # type: () -> int
+        return len(self.names)
+
+
+@attr.s(cmp=False)
+class SignalColumns(object):
+    """
+    Signal attributes of a CanMatrix as arrays, one row per signal.
+
+    * signals, frames, pdus: the objects of the rows, frame and pdu indices,
+    * frame_index: frame of the row, pdu_index: pdu of the row or -1 for signals without pdu,
+    * frame_offsets: rows of frame i are frame_offsets[i] to frame_offsets[i + 1],
+    * name_index, frame_name_index, pdu_name_index: index of the signal, frame and pdu names in names.
+    """
+
+    signals = attr.ib(factory=list)  # type: typing.List[canmatrix.Signal]
+    frames = attr.ib(factory=list)  # type: typing.List[canmatrix.Frame]
+    pdus = attr.ib(factory=list)  # type: typing.List[canmatrix.Pdu]
+
+    start_bit = attr.ib(factory=lambda: array.array('l'))  # type: array.array
+    size = attr.ib(factory=lambda: array.array('l'))  # type: array.array
+    is_little_endian = attr.ib(factory=lambda: array.array('b'))  # type: array.array
+    is_signed = attr.ib(factory=lambda: array.array('b'))  # type: array.array
+    is_float = attr.ib(factory=lambda: array.array('b'))  # type: array.array
+    factor = attr.ib(factory=lambda: array.array('d'))  # type: array.array
+    offset = attr.ib(factory=lambda: array.array('d'))  # type: array.array
+    frame_index = attr.ib(factory=lambda: array.array('l'))  # type: array.array
+    pdu_index = attr.ib(factory=lambda: array.array('l'))  # type: array.array
+    name_index = attr.ib(factory=lambda: array.array('l'))  # type: array.array
+    frame_offsets = attr.ib(factory=lambda: array.array('l', [0]))  # type: array.array
+    frame_name_index = attr.ib(factory=lambda: array.array('l'))  # type: array.array
+    pdu_name_index = attr.ib(factory=lambda: array.array('l'))  # type: array.array
+
+    names = attr.ib(factory=NameTable)  # type: NameTable
+
+    def append(self, signal, frame_index, pdu_index):  # type: (canmatrix.Signal, int, int) -> None
+        """Add a row for signal."""
+        self.signals.append(signal)
+        self.start_bit.append(signal.start_bit)
+        self.size.append(signal.size)
+        self.is_little_endian.append(bool(signal.is_little_endian))
+        self.is_signed.append(bool(signal.is_signed))
+        self.is_float.append(bool(signal.is_float))
+        factor, offset = signal.scaling("float")
+        self.factor.append(factor)
+        self.offset.append(offset)
+        self.frame_index.append(frame_index)
+        self.pdu_index.append(pdu_index)
+        self.name_index.append(self.names.add(signal.name))
+
+    def __len__(self):  # type: () -> int
+        return len(self.signals)
+
+    def name(self, row):  # type: (int) -> str
+        """Name of the signal in row."""
+        return self.names[self.name_index[row]]
+
+    def frame_rows(self, frame_index):  # type: (int) -> range
+        """Rows of the signals of the frame."""
+        return range(self.frame_offsets[frame_index], self.frame_offsets[frame_index + 1])
+
+    def to_numpy(self):  # type: () -> typing.Dict[str, typing.Any]
+        """Return the numeric columns as numpy arrays sharing the memory of the columns, needs numpy."""
+        import numpy
+        return {
+            column: numpy.frombuffer(getattr(self, column), dtype=getattr(self, column).typecode)
+            for column in ("start_bit", "size", "is_little_endian", "is_signed", "is_float", "factor", "offset",
+                           "frame_index", "pdu_index", "name_index", "frame_offsets", "frame_name_index",
+                           "pdu_name_index")
+        }
+
+
+def build_signal_columns(db):  # type: (canmatrix.CanMatrix) -> SignalColumns
+    """
+    Build the columnar view of the signals of db.
+
+    Rows are the signals of db.frames in order, followed per frame by pdu signals which are not
+    signals of the frame itself.
+    Later changes of the matrix are not reflected, build a new view after changing it.
+    """
+    columns = SignalColumns()
+    for frame_index, frame in enumerate(db.frames):
+        columns.frames.append(frame)
+        columns.frame_name_index.append(columns.names.add(frame.name))
+        pdu_of_signal = {}  # type: typing.Dict[int, int]
+        pdu_signals = []  # type: typing.List[typing.Tuple[canmatrix.Signal, int]]
+        for pdu in frame.pdus:
+            pdu_index = len(columns.pdus)
+            columns.pdus.append(pdu)
+            columns.pdu_name_index.append(columns.names.add(pdu.name))
+            for signal in pdu.signals:
+                pdu_of_signal.setdefault(id(signal), pdu_index)
+                pdu_signals.append((signal, pdu_index))
+        frame_signals = set()
+        for signal in frame.signals:
+            frame_signals.add(id(signal))
+            columns.append(signal, frame_index, pdu_of_signal.get(id(signal), -1))
+        for signal, pdu_index in pdu_signals:
+            if id(signal) not in frame_signals:
+                frame_signals.add(id(signal))
+                columns.append(signal, frame_index, pdu_index)
+        columns.frame_offsets.append(len(columns))
+    return columns
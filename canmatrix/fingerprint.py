@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Content fingerprints of CanMatrix objects.
+
+A fingerprint is the sha1 of a canonical serialization of the object graph: attrs fields in
+declaration order, dicts and sets sorted, objects referenced more than once serialized once and
+referred to by their position afterwards. Equal content gives an equal fingerprint in every run,
+independent of object identity and hash randomization.
+"""
+from __future__ import absolute_import, division, print_function
+
+import decimal
+import fractions
+import hashlib
+import typing
+from builtins import *
+
+import attr
+
+import canmatrix
+
+
+def fingerprint_fields(cls):  # type: (type) -> typing.List[typing.Tuple[str, bool]]
+    """Fields of attrs class cls to serialize as (attribute name, lazy container).
+
+    Private fields not set by __init__ are caches and indices and are left out.
+    """
+    fields = []
+    for field in attr.fields(cls):
+        if field.name.startswith("_") and not field.init:
+            continue
+        lazy = field.name.startswith("_") and field.name[1:] in getattr(cls, "lazy_fields", ())
+        fields.append((field.name, lazy))
+    return fields
+
+
+class Fingerprinter(object):
+    """Feed objects to a sha1, see fingerprint()."""
+
+    def __init__(self):
+        self.hash = hashlib.sha1()
+        self.seen = {}  # type: typing.Dict[int, int]
+        self.fields = {}  # type: typing.Dict[type, typing.List[typing.Tuple[str, bool]]]
+        # keep the visited objects alive, their ids must not be reused while hashing
+        self.visited = []  # type: typing.List[typing.Any]
+
+    def write(self, text):  # type: (str) -> None
+        self.hash.update(text.encode("utf-8"))
+
+    def encode_key(self, value):  # type: (typing.Any) -> str
+        """Serialization of a dict key or set item, used to sort them."""
+        key = Fingerprinter()
+        key.add(value)
+        return key.hash.hexdigest()
+
+    def add(self, value):  # type: (typing.Any) -> None
+        if value is None or isinstance(value, (bool, int, float, str, bytes)) or \
+                isinstance(value, (decimal.Decimal, fractions.Fraction)):
+            self.write("%s:%r;" % (type(value).__name__, value))
+        elif isinstance(value, (list, tuple)):
+            self.write("[")
+            for item in value:
+                self.add(item)
+            self.write("]")
+        elif isinstance(value, dict):
+            self.write("{")
+            for encoded, item in sorted(((self.encode_key(key), item) for key, item in value.items()),
+                                        key=lambda pair: pair[0]):
+                self.write(encoded)
+                self.add(item)
+            self.write("}")
+        elif isinstance(value, (set, frozenset)):
+            self.write("{")
+            for encoded in sorted(self.encode_key(item) for item in value):
+                self.write(encoded)
+            self.write("}")
+        elif id(value) in self.seen:
+            self.write("@%d;" % self.seen[id(value)])
+        else:
+            self.seen[id(value)] = len(self.seen)
+            self.visited.append(value)
+            self.add_object(value)
+
+    def add_object(self, value):  # type: (typing.Any) -> None
+        cls = type(value)
+        self.write(cls.__name__ + "(")
+        if attr.has(cls):
+            if cls not in self.fields:
+                self.fields[cls] = fingerprint_fields(cls)
+            for name, lazy in self.fields[cls]:
+                item = getattr(value, name)
+                self.write(name.lstrip("_") + "=")
+                if lazy and not item:
+                    # unallocated and empty lazy containers are the same content
+                    self.write("-;")
+                else:
+                    self.add(item)
+        elif hasattr(value, "__dict__"):
+            for name in sorted(vars(value)):
+                self.write(name + "=")
+                self.add(vars(value)[name])
+        else:
+            self.write(repr(value))
+        self.write(")")
+
+
+def fingerprint(value):  # type: (typing.Any) -> str
+    """Return the content fingerprint of value, a CanMatrix or any of its objects, as hex string."""
+    fingerprinter = Fingerprinter()
+    fingerprinter.add(value)
+    return fingerprinter.hash.hexdigest()
@@ -12,39 +12,85 @@ import canmatrix.cancluster
 
 if sys.version_info > (3, 0):
     import io
+    from importlib.util import find_spec
 else:
     import StringIO
+    from pkgutil import find_loader as find_spec
 
 logger = logging.getLogger(__name__)
 moduleList = ["arxml", "csv", "dbc", "dbf", "json",
               "kcd", "fibex", "sym", "xls", "xlsx", "yaml", "scapy", "wireshark"]
-loadedFormats = []
+
+# capabilities and file extensions of the formats, declared here so the format modules (and their
+# dependencies like lxml, xlrd or xlsxwriter) are imported on first use only, see get_format_module
+formatCapabilities = {
+    "arxml": ["load", "clusterImporter", "clusterExporter"],
+    "csv": ["dump"],
+    "dbc": ["load", "dump"],
+    "dbf": ["load", "dump"],
+    "json": ["load", "dump", "extension"],
+    "kcd": ["load", "dump", "clusterImporter", "clusterExporter", "extension"],
+    "fibex": ["dump", "clusterExporter", "extension"],
+    "sym": ["load", "dump"],
+    "xls": ["load", "dump"],
+    "xlsx": ["load", "dump"],
+    "yaml": ["load", "dump", "extension"],
+    "scapy": ["dump", "extension"],
+    "wireshark": ["dump", "extension"],
+}  # type: typing.Mapping[str, typing.Sequence[str]]
+formatExtensions = {
+    "json": "json",
+    "kcd": "kcd",
+    "fibex": "xml",
+    "yaml": "yaml",
+    "scapy": "py",
+    "wireshark": "lua",
+}  # type: typing.Mapping[str, str]
+
+loadedFormats = []  # type: typing.MutableSequence[str]
 supportedFormats = {}  # type: typing.MutableMapping[str, typing.MutableSequence[str]]
-extensionMapping = {}
+extensionMapping = {}  # type: typing.MutableMapping[str, str]
 
-for module in moduleList:
+
+def module_capabilities(module_instance):  # type: (typing.Any) -> typing.List[str]
+    return [capability for capability in ("load", "dump", "clusterImporter", "clusterExporter", "extension")
+            if capability in dir(module_instance)]
+
+
+def get_format_module(name):  # type: (str) -> typing.Any
+    """Import the module of format name on first use.
+
+    The capabilities of the format are updated from the module. If the module can not be imported,
+    for example because of a missing dependency, the format is removed from supportedFormats.
+
+    :param name: format name like "arxml"
+    :return: the format module, None if the format is not supported
+    """
+    module_name = "canmatrix.formats." + name
+    if name in loadedFormats:
+        return sys.modules[module_name]
+    if name not in supportedFormats:
+        return None
     try:
-        importlib.import_module("canmatrix.formats." + module)
-        loadedFormats.append(module)
+        module_instance = importlib.import_module(module_name)
     except ImportError:
-        logger.info("%s is not supported", module)
+        logger.info("%s is not supported", name)
+        del supportedFormats[name]
+        del extensionMapping[name]
+        return None
+    loadedFormats.append(name)
+    supportedFormats[name] = module_capabilities(module_instance)
+    extensionMapping[name] = getattr(module_instance, "extension", name)
+    return module_instance
 
-for loadedModule in loadedFormats:
-    supportedFormats[loadedModule] = []
-    moduleInstance = sys.modules["canmatrix.formats." + loadedModule]
-    if "load" in dir(moduleInstance):
-        supportedFormats[loadedModule].append("load")
-    if "dump" in dir(moduleInstance):
-        supportedFormats[loadedModule].append("dump")
-    if "clusterImporter" in dir(moduleInstance):
-        supportedFormats[loadedModule].append("clusterImporter")
-    if "clusterExporter" in dir(moduleInstance):
-        supportedFormats[loadedModule].append("clusterExporter")
-    if "extension" in dir(moduleInstance):
-        supportedFormats[loadedModule].append("extension")
-        extensionMapping[loadedModule] = moduleInstance.extension  # type: ignore
-    else:
-        extensionMapping[loadedModule] = loadedModule
+
+for module in moduleList:
+    # only look for the module file, importing it is left to get_format_module
+    if find_spec("canmatrix.formats." + module) is None:
+        logger.info("%s is not supported", module)
+        continue
+    supportedFormats[module] = list(formatCapabilities.get(module, ()))
+    extensionMapping[module] = formatExtensions.get(module, module)
 
 
 def loads(string, import_type=None, key="", encoding="utf-8", **options):
@@ -68,8 +114,9 @@ def loadp(path, import_type=None, key="", **options):
     # type: (str, str, str, **str) -> typing.Union[typing.Dict[str, canmatrix.CanMatrix], None]
     with open(path, "rb") as fileObject:
         if not import_type:
-            for supportedImportType, extension in extensionMapping.items():
-                if path.lower().endswith(extension) and "load" in supportedFormats[supportedImportType]:
+            for supportedImportType, extension in list(extensionMapping.items()):
+                if path.lower().endswith(extension) and "load" in supportedFormats[supportedImportType] and \
+                        get_format_module(supportedImportType) is not None:
                     import_type = supportedImportType
                     break
 
@@ -89,7 +136,10 @@ def loadp_flat(path, import_type=None, key="", **options):
 def load(file_object, import_type, key="", **options):
     # type: (typing.BinaryIO, str, str, **str) -> typing.Union[typing.Dict[str, canmatrix.CanMatrix], None]
     dbs = {}  # type: typing.Dict[str, canmatrix.CanMatrix]
-    module_instance = sys.modules["canmatrix.formats." + import_type]
+    module_instance = get_format_module(import_type)
+    if module_instance is None or not hasattr(module_instance, "load"):
+        logger.error("This file format is not supported for reading")
+        return None
     if "clusterImporter" in supportedFormats[import_type]:
         dbs = module_instance.load(file_object, **options)  # type: ignore
     else:
@@ -105,7 +155,10 @@ def load_flat(file_object, import_type, key="", **options):
 
 def dump(can_matrix_or_cluster, file_object, export_type, **options):
     # type: (typing.Union[canmatrix.CanMatrix, typing.Mapping[str, canmatrix.CanMatrix]], typing.IO, str, **str) -> None
-    module_instance = sys.modules["canmatrix.formats." + export_type]
+    module_instance = get_format_module(export_type)
+    if module_instance is None or not hasattr(module_instance, "dump"):
+        logger.error("This file format is not supported for writing")
+        return
     if isinstance(can_matrix_or_cluster, canmatrix.CanMatrix):
         module_instance.dump(can_matrix_or_cluster, file_object, **options)  # type: ignore
     elif "clusterExporter" in supportedFormats[export_type]:
@@ -115,11 +168,16 @@ def dump(can_matrix_or_cluster, file_object, export_type, **options):
 def dumpp(can_cluster, path, export_type=None, **options):
     # type: (typing.Mapping[str, canmatrix.CanMatrix], str, str, **str) -> None
     if not export_type:
-        for key, extension in extensionMapping.items():
-            if path.lower().endswith("." + extension) and "dump" in supportedFormats[key]:
+        for key, extension in list(extensionMapping.items()):
+            if path.lower().endswith("." + extension) and "dump" in supportedFormats[key] and \
+                    get_format_module(key) is not None:
                 export_type = key
                 break
     if export_type:
+        module_instance = get_format_module(export_type)
+        if module_instance is None or not hasattr(module_instance, "dump"):
+            logger.error("This file format is not supported for writing")
+            return
         if "clusterExporter" in supportedFormats[export_type]:
             file_object = open(path, "wb")  # type: typing.IO
             dump(can_cluster, file_object, export_type, **options)
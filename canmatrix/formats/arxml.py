@@ -26,12 +26,19 @@
 
 from __future__ import absolute_import, division, print_function
 
+import collections
 import decimal
+import hashlib
 import logging
+import multiprocessing
+import os
+import pickle
+import tempfile
 import typing
 from builtins import *
 
 import lxml.etree
+from past.builtins import basestring
 
 import canmatrix
 import canmatrix.types
@@ -49,6 +56,8 @@ class ArTree(object):
         self._name = name
         self._ref = ref
         self._array = []  # type: typing.List[ArTree]
+        # absolute AUTOSAR path -> element, only filled for the root of the tree
+        self.path_index = None  # type: typing.Optional[typing.Dict[str, lxml.etree._Element]]
 
     def append_child(self, name, child):  # type: (str, typing.Any) -> ArTree
         """Append new child and return it."""
@@ -67,6 +76,19 @@ class ArTree(object):
         return self._ref
 
 
+class ArxmlLoadResult(dict):
+    """Result of load: dict of the CanMatrix objects, which also carries what was read from the parsed document.
+
+    namespace is the xml namespace in {} as used by the decoders. tree is the parsed lxml ElementTree, only kept
+    if load was called with arxmlKeepTree, else None.
+    """
+
+    def __init__(self, *arg, **kw):
+        super(ArxmlLoadResult, self).__init__(*arg, **kw)
+        self.namespace = ""  # type: str
+        self.tree = None  # type: typing.Optional[lxml.etree._ElementTree]
+
+
 # for typing only
 _Element = lxml.etree._Element
 _DocRoot = typing.Union[_Element, ArTree]
@@ -124,16 +146,92 @@ def get_base_type_of_signal(signal):
 # read ARXML
 ###################################
 
-def fill_tree_from_xml(tag, ar_tree, namespace):
-    # type: (_Element, ArTree, str) -> None
-    """Parse the xml tree into ArTree objects."""
+def fill_tree_from_xml(tag, ar_tree, namespace, path_index=None, path=""):
+    # type: (_Element, ArTree, str, typing.Optional[typing.Dict[str, _Element]], str) -> None
+    """Parse the xml tree into ArTree objects.
+
+    If path_index is given, every named element is also registered there with its absolute AUTOSAR path.
+    The first element found for a path wins, like the lookup in ArTree.get_child_by_name.
+    """
     for child in tag:  # type: _Element
         name_elem = child.find('./' + namespace + 'SHORT-NAME')
         # long_name = child.find('./' + namespace + 'LONG-NAME')
         if name_elem is not None and child is not None:
-            fill_tree_from_xml(child, ar_tree.append_child(name_elem.text, child), namespace)
+            child_index = path_index if name_elem.text is not None else None
+            child_path = path + "/" + name_elem.text if child_index is not None else path
+            if child_index is not None and child_path not in child_index:
+                child_index[child_path] = child
+            fill_tree_from_xml(child, ar_tree.append_child(name_elem.text, child), namespace, child_index, child_path)
         if name_elem is None and child is not None:
-            fill_tree_from_xml(child, ar_tree, namespace)
+            fill_tree_from_xml(child, ar_tree, namespace, path_index, path)
+
+
+# element types (and their content) which survive the streaming parse, see parse_streaming
+streaming_element_types = frozenset([
+    "CAN-CLUSTER", "FLEXRAY-CLUSTER", "ETHERNET-CLUSTER",
+    "CAN-FRAME", "FLEXRAY-FRAME", "ETHERNET-FRAME",
+    "I-SIGNAL", "I-SIGNAL-GROUP", "SYSTEM-SIGNAL", "SYSTEM-SIGNAL-GROUP",
+    "ECUC-MODULE-CONFIGURATION-VALUES"])
+
+
+def is_streaming_element_type(local_name):  # type: (str) -> bool
+    """Check if the element type is needed by the decoders, all kinds of PDUs are."""
+    return local_name in streaming_element_types or local_name.endswith("PDU")
+
+
+def parse_streaming(file):
+    # type: (typing.Any) -> typing.Tuple[_Element, str, ArTree]
+    """Parse the xml incrementally and keep only what the CAN/FlexRay/Ethernet decoders need.
+
+    Subtrees which neither are nor contain one of the streaming element types are cleared and dropped as soon as
+    they are finished. SHORT-NAMEs are kept, so the remaining tree still names every package on the way down.
+    The returned ArTree has no children, only the path index of all kept named elements, references are resolved
+    through it after the parse.
+
+    :param file: file name or file object
+    :return: root element of the pruned tree, namespace and ArTree with path index
+    """
+    ar_tree = ArTree()
+    ar_tree.path_index = {}
+    root = None  # type: typing.Optional[_Element]
+    ns = ""
+    open_elements = []  # type: typing.List[typing.List]  # [short name, contains kept element] per open element
+    kept_depth = 0
+    local_names = {}  # type: typing.Dict[str, str]  # tag -> local name, documents may have no namespace
+    for event, element in lxml.etree.iterparse(file, events=("start", "end")):
+        local_name = local_names.get(element.tag)
+        if local_name is None:
+            local_name = local_names[element.tag] = lxml.etree.QName(element).localname
+        if event == "start":
+            if root is None:
+                root = element
+                ns = "{" + (lxml.etree.QName(element).namespace or "") + "}"
+            open_elements.append([None, False])
+            if is_streaming_element_type(local_name):
+                kept_depth += 1
+            continue
+
+        name, contains_kept = open_elements.pop()
+        if local_name == "SHORT-NAME":
+            if open_elements and open_elements[-1][0] is None:
+                open_elements[-1][0] = element.text
+            continue
+        is_kept_type = is_streaming_element_type(local_name)
+        if kept_depth > 0 or contains_kept:
+            if name is not None:
+                path = "/" + "/".join([item[0] for item in open_elements if item[0] is not None] + [name])
+                if path not in ar_tree.path_index:
+                    ar_tree.path_index[path] = element
+            if open_elements:
+                open_elements[-1][1] = True
+        else:
+            element.clear()
+            parent = element.getparent()
+            if parent is not None:
+                parent.remove(element)
+        if is_kept_type:
+            kept_depth -= 1
+    return root, ns, ar_tree
 
 
 def find_children_by_path(from_element, path, root_or_cache, namespace):
@@ -193,6 +291,8 @@ def get_cached_element_by_path(data_tree, path):
     if not isinstance(data_tree, ArTree):
         logger.warning("%s not called with ArTree, return None", get_cached_element_by_path.__name__)
         return None
+    if data_tree.path_index is not None:
+        return data_tree.path_index.get("/" + "/".join(name for name in path.split('/') if name.strip()))
     ptr = data_tree
     for name in path.split('/'):
         if ptr is None:
@@ -202,15 +302,81 @@ def get_cached_element_by_path(data_tree, path):
     return ptr.ref if ptr else None
 
 
+child_lookup_cache = None  # type: typing.Optional[typing.Dict[_Element, typing.Dict[typing.Optional[str], typing.List[_Element]]]]
+
+
+def get_children_by_tag(element):
+    # type: (_Element) -> typing.Dict[typing.Optional[str], typing.List[_Element]]
+    """Get direct children of element grouped by tag, all children are stored with key None.
+
+    The map is built on the first visit of the element and cached in child_lookup_cache.
+    """
+    children_by_tag = child_lookup_cache.get(element)
+    if children_by_tag is None:
+        children_by_tag = {None: []}
+        for child in element:
+            if callable(child.tag):  # comments and processing instructions
+                continue
+            children_by_tag[None].append(child)
+            children_by_tag.setdefault(child.tag, []).append(child)
+        child_lookup_cache[element] = children_by_tag
+    return children_by_tag
+
+
+def find_scoped(parent, tag, first_only):
+    # type: (_Element, str, bool) -> typing.Union[_Element, typing.List[_Element], None]
+    """Search descendants of parent level by level and stop at the first level with a matching tag.
+
+    :param parent: element to search in
+    :param tag: tag with namespace
+    :param first_only: return only the first match (or None) instead of all matches of that level
+    """
+    level = [parent]
+    while level:
+        found = []  # type: typing.List[_Element]
+        next_level = []  # type: typing.List[_Element]
+        for element in level:
+            children_by_tag = child_lookup_cache.get(element)
+            if children_by_tag is None:
+                children_by_tag = get_children_by_tag(element)
+            matches = children_by_tag.get(tag)
+            if matches:
+                if first_only:
+                    return matches[0]
+                found += matches
+            elif not found:
+                next_level += children_by_tag[None]
+        if found:
+            return found
+        level = next_level
+    return None if first_only else []
+
+
+def find_descendant(parent, tag):
+    # type: (_Element, str) -> typing.Optional[_Element]
+    """Find first descendant with tag, scoped if child_lookup_cache is active."""
+    if child_lookup_cache is None or '[' in tag:
+        return parent.find('.//' + tag)
+    return find_scoped(parent, tag, True)
+
+
+def find_descendants(parent, tag):
+    # type: (_Element, str) -> typing.List[_Element]
+    """Find all descendants with tag, only of the first matching level if child_lookup_cache is active."""
+    if child_lookup_cache is None or '[' in tag:
+        return parent.findall('.//' + tag)
+    return find_scoped(parent, tag, False)
+
+
 def get_child(parent, tag_name, root_or_cache, namespace):
     # type: (_Element, str, _DocRoot, str) -> typing.Optional[_Element]
     """Get first sub-child or referenced sub-child with given name."""
     # logger.debug("get_child: " + tag_name)
     if parent is None:
         return None
-    ret = parent.find('.//' + namespace + tag_name)
+    ret = find_descendant(parent, namespace + tag_name)
     if ret is None:  # no direct element - try reference
-        reference = parent.find('.//' + namespace + tag_name + '-REF')
+        reference = find_descendant(parent, namespace + tag_name + '-REF')
         if reference is not None:
             if isinstance(root_or_cache, ArTree):
                 ret = get_cached_element_by_path(root_or_cache, reference.text)
@@ -223,9 +389,9 @@ def get_children(parent, tag_name, root_or_cache, namespace):
     # type: (_Element, str, _DocRoot, str) -> typing.Sequence[_Element]
     if parent is None:
         return []
-    ret = parent.findall('.//' + namespace + tag_name)
+    ret = find_descendants(parent, namespace + tag_name)
     if not ret:  # no direct element - get references
-        ret_list = parent.findall('.//' + namespace + tag_name + '-REF')
+        ret_list = find_descendants(parent, namespace + tag_name + '-REF')
         if isinstance(root_or_cache, ArTree):
             ret = [get_cached_element_by_path(root_or_cache, item.text) for item in ret_list]
         else:
@@ -253,15 +419,17 @@ def get_sys_signals(sys_signal, sys_signal_array, frame, group_id, ns):
     for signal in sys_signal_array:
         frame.add_signal(signal)
     group_name = get_element_name(sys_signal, ns)
-    logger.debug("01 in get_sys_signals function, signal group name:"+group_name+", group_id: "+str(group_id)+", signal name list: "+str(members))
+    logger.debug("01 in get_sys_signals function, signal group name: %s, group_id: %s, signal name list: %s", group_name, group_id, members)
     
     frame.add_signal_group(group_name, group_id, members)  # todo use group_id instead of 1?
     '''for the flexray, input frame is set as the PDU name '''
 
-    if frame.get_signal_group_for_signal(sys_signal_array[0]) is None:
-        logger.debug("02 in get_sys_signals function,signal group not found with signal "+get_element_name(sys_signal_array[0],ns))
-    else:
-        logger.debug("03 in get_sys_signals function,signal group "+frame.get_signal_group_for_signal(sys_signal_array[0])+" found by signal "+get_element_name(sys_signal_array[0],ns))
+    if logger.isEnabledFor(logging.DEBUG):
+        signal_group = frame.get_signal_group_for_signal(sys_signal_array[0])
+        if signal_group is None:
+            logger.debug("02 in get_sys_signals function,signal group not found with signal %s", get_element_name(sys_signal_array[0], ns))
+        else:
+            logger.debug("03 in get_sys_signals function,signal group %s found by signal %s", signal_group, get_element_name(sys_signal_array[0], ns))
 
 
 
@@ -817,9 +985,16 @@ def extract_cm_from_ecuc(com_module, root_or_cache, ns):
     db.recalc_dlc(strategy="max")
     return {"": db}
 
-def decode_ethernet_helper(root, root_or_cache, ns, float_factory):
+def count_descendants(elements, tag):  # type: (typing.Sequence[_Element], str) -> int
+    """Number of tag elements below elements, the units of the decode progress."""
+    return sum(1 for element in elements for _ in element.iter(tag))
+
+
+def decode_ethernet_helper(root, root_or_cache, ns, float_factory, progress=None):
     found_matrixes = {}
     ecs = root.findall('.//' + ns + 'ETHERNET-CLUSTER')
+    if progress is not None:
+        progress.start("decode_ethernet", count_descendants(ecs, ns + "PDU-TRIGGERING"))
     for ec in ecs:
         baudrate_elem = ec.find(".//" + ns + "BAUDRATE")
         physical_channels = ec.findall('.//' + ns + "ETHERNET-PHYSICAL-CHANNEL")
@@ -839,240 +1014,267 @@ def decode_ethernet_helper(root, root_or_cache, ns, float_factory):
                 pdu_sig_mapping = get_children(ipdu, "I-SIGNAL-TO-I-PDU-MAPPING", root_or_cache, ns)
                 get_signals(pdu_sig_mapping, target_frame, root_or_cache, ns, None, float_factory)
                 db.add_frame(target_frame)
+                if progress is not None:
+                    progress.step()
     return found_matrixes
 
-def decode_flexray_helper(root, root_or_cache, ns, float_factory):
+def decode_flexray_physical_channel(pc, root_or_cache, ns, float_factory, frame_counter=0, progress=None):
+    # type: (_Element, _DocRoot, str, _FloatFactory, int, typing.Optional[canmatrix.Progress]) -> typing.Tuple[str, canmatrix.CanMatrix, int]
+    """Decode one FLEXRAY-PHYSICAL-CHANNEL.
+
+    :param frame_counter: frame counter of all frames decoded before, used as arbitration id
+    :param progress: Progress to count the decoded frames in
+    :return: channel name, CanMatrix of the channel and new frame counter
+    """
+    db = canmatrix.CanMatrix()
+    db.is_flexray = True
+    db.add_ecu_defines("NWM-Stationsadresse", 'HEX 0 63')
+    db.add_ecu_defines("NWM-Knoten", 'ENUM  "nein","ja"')        
+    db.add_signal_defines("LongName", 'STRING')
+    db.add_frame_defines("GenMsgDelayTime", 'INT 0 65535')
+    db.add_frame_defines("GenMsgNrOfRepetitions", 'INT 0 65535')
+    db.add_frame_defines("GenMsgStartValue", 'STRING')
+    db.add_frame_defines("GenMsgStartDelayTime", 'INT 0 65535')
+    db.add_frame_defines("GenMsgSendType",
+                         'ENUM  "cyclicX","spontanX","cyclicIfActiveX","spontanWithDelay","cyclicAndSpontanX","cyclicAndSpontanWithDelay","spontanWithRepitition","cyclicIfActiveAndSpontanWD","cyclicIfActiveFast","cyclicWithRepeatOnDemand","none"')
+
+    channel_name = get_element_name(pc, ns)
+    frame_triggers = pc.findall('.//' + ns + "FLEXRAY-FRAME-TRIGGERING")
+    for xml_frame_trigger in frame_triggers:
+        frame_counter += 1
+        logger.debug(" flexray_helper frame_counter is :"+str(frame_counter))
+        frame_name = get_element_name(xml_frame_trigger, ns)
+        slot_id = int(get_child(xml_frame_trigger, "SLOT-ID", root_or_cache, ns).text)
+        base_cycle = get_child(xml_frame_trigger, "BASE-CYCLE", root_or_cache, ns).text
+        ipdu_triggerings = get_children(xml_frame_trigger, "PDU-TRIGGERING", root_or_cache, ns)
+        frame_repetition_cycle = find_children_by_path(xml_frame_trigger, "CYCLE-REPETITION/CYCLE-REPETITION", root_or_cache, ns)[0].text
+        frame_size = int(find_children_by_path(xml_frame_trigger, "FRAME/FRAME-LENGTH", root_or_cache, ns)[0].text)
+        # for flexray,create the new frame struct object.
+        struct_frame = canmatrix.Frame(size = frame_size, arbitration_id = frame_counter)
+        struct_frame.name = frame_name
+        struct_frame.is_FlexrayFrame = True
+        struct_frame.slot_id = str(slot_id)+"-"+str(base_cycle)+"-"+frame_repetition_cycle.split("-")[-1]
+        struct_frame.arbitration_id = canmatrix.ArbitrationId(frame_counter, extended=False)
+        struct_frame.base_cycle = base_cycle
+        struct_frame.repitition_cycle = frame_repetition_cycle.replace("CYCLE-REPETITION-","")
+        struct_frame.cycle_time = 5*int(struct_frame.repitition_cycle)
+        frame_counter += 1
+        logger.debug("flexray_helper frame name is :"+str(frame_name))
+        #db.add_frame(frame)
+        logger.debug(" flexray_helper slot_id is :"+str(slot_id))
+        logger.debug(" flexray_helper base_cycle is :"+str(base_cycle))
+        logger.debug(" flexray_helper frame_repetition_cycle is :"+str(struct_frame.repitition_cycle))
+        logger.debug(" flexray_helper frame_size is :"+str(frame_size))
+        for ipdu_triggering in ipdu_triggerings:
+            if ipdu_triggering is None:
+                logger.debug(" flexray_helper ipdu_triggering is none.")
+            else:
+                logger.debug(" flexray_helper ipdu_triggering name is :"+str(get_element_name(ipdu_triggering, ns)))
+            ipdu_triggering_name = get_element_name(ipdu_triggering, ns)
+            '''there are 3 type pdu, N-PDU, NM-PDU,I-SIGNAL-I-PDU. '''
+            pdu_type = find_descendant(ipdu_triggering, ns + "I-PDU-REF").attrib["DEST"]
+            if pdu_type.find("I-PDU") !=-1:
+                struct_frame.add_attribute("GenMsgSendType", "cyclicX")
+            else:
+                struct_frame.add_attribute("GenMsgSendType", "spontanX")
+            ipdu = get_child(ipdu_triggering, "I-PDU", root_or_cache, ns)
+            ipdu_name = get_element_name(ipdu, ns)
+            
+            ipdu_length = int(find_descendant(ipdu, ns + "LENGTH").text)
+            pdu_port = get_child(ipdu_triggering, "I-PDU-PORT-REF", root_or_cache, ns)
+            pdu_port_type = get_child(ipdu_triggering, "I-PDU-PORT-REF", root_or_cache, ns).text.split("/")[-1]
+            recieve_ecu_name = None
+            if pdu_port_type.find("IN"):
+                recieve_ecu_name = get_element_name(pdu_port.getparent().getparent().getparent().getparent(), ns)                    
+            #logger.debug(" flexray_helper pdu_type is :"+str(pdu_type))
+            #logger.debug(" flexray_helper ipdu_length is :"+str(ipdu_length))
+            #logger.debug(" flexray_helper pdu_port_type is :"+str(pdu_port_type))
+            #logger.debug(" flexray_helper ipdu_name is :"+str(ipdu_name))
+            target_pdu = canmatrix.Pdu(name = ipdu_name, size=ipdu_length,pdu_type=pdu_type,
+                                       triggering_name = ipdu_triggering_name, port_type=pdu_port_type)
+            
+            sig_pdu_mappings = get_children(ipdu, "I-SIGNAL-TO-I-PDU-MAPPING", root_or_cache, ns)
+            
+            if sig_pdu_mappings is None or len(sig_pdu_mappings)==0:
+                logger.debug(" flexray_helper no I-SIGNAL-TO-I-PDU-MAPPING found under PDU:"+str(ipdu_name))
+            else:
+                get_signals(sig_pdu_mappings, struct_frame,target_pdu, recieve_ecu_name,root_or_cache, ns, None, float_factory)   
+            
+            isignal_in_sig_pdu_mappings = get_children(ipdu, "I-SIGNAL", root_or_cache, ns) 
+            for struct_signal in  target_pdu.signals:
+                struct_signal.pdu_name = ipdu_name
+                struct_signal.pdu_type = pdu_type
+                struct_signal.pdu_length = ipdu_length
+                struct_signal.pdu_portType = pdu_port_type
+                sig_group = target_pdu.get_signal_group_for_signal(str(struct_signal))
+                if sig_group is not None:
+                    struct_signal.signal_group = str(sig_group.name)
+            for isignal in  isignal_in_sig_pdu_mappings:
+                isignal_name = get_element_name(isignal, ns)
+                #logger.debug(" flexray_helper found signal under PDU is :"+str(isignal_name))                  
+            struct_frame.add_pdu(target_pdu)
+        db.add_frame(struct_frame)
+        if progress is not None:
+            progress.step()
+    return channel_name, db, frame_counter
+
+
+def decode_flexray_helper(root, root_or_cache, ns, float_factory, progress=None):
     found_matrixes = {}
     logger.debug("-------------decode_flexray_helper is excuted------------.")
     fcs = root.findall('.//' + ns + 'FLEXRAY-CLUSTER')
+    if progress is not None:
+        progress.start("decode_flexray", count_descendants(fcs, ns + "FLEXRAY-FRAME-TRIGGERING"))
     frame_counter = 0
     for fc in fcs:
         physical_channels = fc.findall('.//' + ns + "FLEXRAY-PHYSICAL-CHANNEL")
         for pc in physical_channels:
-            db = canmatrix.CanMatrix()
-            db.is_flexray = True
-            db.add_ecu_defines("NWM-Stationsadresse", 'HEX 0 63')
-            db.add_ecu_defines("NWM-Knoten", 'ENUM  "nein","ja"')        
-            db.add_signal_defines("LongName", 'STRING')
-            db.add_frame_defines("GenMsgDelayTime", 'INT 0 65535')
-            db.add_frame_defines("GenMsgNrOfRepetitions", 'INT 0 65535')
-            db.add_frame_defines("GenMsgStartValue", 'STRING')
-            db.add_frame_defines("GenMsgStartDelayTime", 'INT 0 65535')
-            db.add_frame_defines("GenMsgSendType",
-                                 'ENUM  "cyclicX","spontanX","cyclicIfActiveX","spontanWithDelay","cyclicAndSpontanX","cyclicAndSpontanWithDelay","spontanWithRepitition","cyclicIfActiveAndSpontanWD","cyclicIfActiveFast","cyclicWithRepeatOnDemand","none"')
-
-            channel_name = get_element_name(pc, ns)
+            channel_name, db, frame_counter = decode_flexray_physical_channel(
+                pc, root_or_cache, ns, float_factory, frame_counter, progress)
             found_matrixes[channel_name] = db
-            frame_triggers = pc.findall('.//' + ns + "FLEXRAY-FRAME-TRIGGERING")
-            for xml_frame_trigger in frame_triggers:
-                frame_counter += 1
-                logger.debug(" flexray_helper frame_counter is :"+str(frame_counter))
-                frame_name = get_element_name(xml_frame_trigger, ns)
-                slot_id = int(get_child(xml_frame_trigger, "SLOT-ID", root_or_cache, ns).text)
-                base_cycle = get_child(xml_frame_trigger, "BASE-CYCLE", root_or_cache, ns).text
-                ipdu_triggerings = get_children(xml_frame_trigger, "PDU-TRIGGERING", root_or_cache, ns)
-                frame_repetition_cycle = find_children_by_path(xml_frame_trigger, "CYCLE-REPETITION/CYCLE-REPETITION", root_or_cache, ns)[0].text
-                network_endpoints = pc.findall('.//' + ns + "NETWORK-ENDPOINT")
-                frame_size = int(find_children_by_path(xml_frame_trigger, "FRAME/FRAME-LENGTH", root_or_cache, ns)[0].text)
-                # for flexray,create the new frame struct object.
-                struct_frame = canmatrix.Frame(size = frame_size, arbitration_id = frame_counter)
-                struct_frame.name = frame_name
-                struct_frame.is_FlexrayFrame = True
-                struct_frame.slot_id = str(slot_id)+"-"+str(base_cycle)+"-"+frame_repetition_cycle.split("-")[-1]
-                struct_frame.arbitration_id = canmatrix.ArbitrationId(frame_counter, extended=False)
-                struct_frame.base_cycle = base_cycle
-                struct_frame.repitition_cycle = frame_repetition_cycle.replace("CYCLE-REPETITION-","")
-                struct_frame.cycle_time = 5*int(struct_frame.repitition_cycle)
-                frame_counter += 1
-                logger.debug("flexray_helper frame name is :"+str(frame_name))
-                #db.add_frame(frame)
-                logger.debug(" flexray_helper slot_id is :"+str(slot_id))
-                logger.debug(" flexray_helper base_cycle is :"+str(base_cycle))
-                logger.debug(" flexray_helper frame_repetition_cycle is :"+str(struct_frame.repitition_cycle))
-                logger.debug(" flexray_helper frame_size is :"+str(frame_size))
-                for ipdu_triggering in ipdu_triggerings:
-                    if ipdu_triggering is None:
-                        logger.debug(" flexray_helper ipdu_triggering is none.")
-                    else:
-                        logger.debug(" flexray_helper ipdu_triggering name is :"+str(get_element_name(ipdu_triggering, ns)))
-                    ipdu_triggering_name = get_element_name(ipdu_triggering, ns)
-                    '''there are 3 type pdu, N-PDU, NM-PDU,I-SIGNAL-I-PDU. '''
-                    pdu_type = ipdu_triggering.find('.//'+ns+"I-PDU-REF").attrib["DEST"]
-                    if pdu_type.find("I-PDU") !=-1:
-                        struct_frame.add_attribute("GenMsgSendType", "cyclicX")
-                    else:
-                        struct_frame.add_attribute("GenMsgSendType", "spontanX")
-                    ipdu = get_child(ipdu_triggering, "I-PDU", root_or_cache, ns)
-                    ipdu_name = get_element_name(ipdu, ns)
-                    
-                    ipdu_length = int(ipdu.find('.//'+ns+"LENGTH").text)
-                    pdu_port = get_child(ipdu_triggering, "I-PDU-PORT-REF", root_or_cache, ns)
-                    pdu_port_type = get_child(ipdu_triggering, "I-PDU-PORT-REF", root_or_cache, ns).text.split("/")[-1]
-                    recieve_ecu_name = None
-                    if pdu_port_type.find("IN"):
-                        recieve_ecu_name = get_element_name(pdu_port.getparent().getparent().getparent().getparent(), ns)                    
-                    #logger.debug(" flexray_helper pdu_type is :"+str(pdu_type))
-                    #logger.debug(" flexray_helper ipdu_length is :"+str(ipdu_length))
-                    #logger.debug(" flexray_helper pdu_port_type is :"+str(pdu_port_type))
-                    #logger.debug(" flexray_helper ipdu_name is :"+str(ipdu_name))
-                    target_pdu = canmatrix.Pdu(name = ipdu_name, size=ipdu_length,pdu_type=pdu_type,
-                                               triggering_name = ipdu_triggering_name, port_type=pdu_port_type)
-                    
-                    sig_pdu_mappings = get_children(ipdu, "I-SIGNAL-TO-I-PDU-MAPPING", root_or_cache, ns)
-                    
-                    if sig_pdu_mappings is None or len(sig_pdu_mappings)==0:
-                        logger.debug(" flexray_helper no I-SIGNAL-TO-I-PDU-MAPPING found under PDU:"+str(ipdu_name))
-                    else:
-                        get_signals(sig_pdu_mappings, struct_frame,target_pdu, recieve_ecu_name,root_or_cache, ns, None, float_factory)   
-                    
-                    isignal_in_sig_pdu_mappings = get_children(ipdu, "I-SIGNAL", root_or_cache, ns) 
-                    for struct_signal in  target_pdu.signals:
-                        struct_signal.pdu_name = ipdu_name
-                        struct_signal.pdu_type = pdu_type
-                        struct_signal.pdu_length = ipdu_length
-                        struct_signal.pdu_portType = pdu_port_type
-                        sig_group = target_pdu.get_signal_group_for_signal(str(struct_signal))
-                        if sig_group is not None:
-                            struct_signal.signal_group = str(sig_group.name)
-                    for isignal in  isignal_in_sig_pdu_mappings:
-                        isignal_name = get_element_name(isignal, ns)
-                        #logger.debug(" flexray_helper found signal under PDU is :"+str(isignal_name))                  
-                    struct_frame.add_pdu(target_pdu)
-                db.add_frame(struct_frame)
     return found_matrixes
 
-def decode_can_helper(root, root_or_cache, ns, float_factory, ignore_cluster_info):
+
+def decode_can_physical_channel(cc, pc, root_or_cache, ns, float_factory, frame_counter=0, progress=None):
+    # type: (_Element, _Element, _DocRoot, str, _FloatFactory, int, typing.Optional[canmatrix.Progress]) -> typing.Tuple[str, canmatrix.CanMatrix, int]
+    """Decode one CAN-PHYSICAL-CHANNEL of the CAN-CLUSTER cc.
+
+    :param frame_counter: frame counter of all frames decoded before
+    :param progress: Progress to count the decoded frames in
+    :return: channel name (the cluster name), CanMatrix of the channel and new frame counter
+    """
+    speed = get_child(cc, "SPEED", root_or_cache, ns)
+    db = canmatrix.CanMatrix()
+    db.is_flexray = False
+    db.add_ecu_defines("NWM-Stationsadresse", 'HEX 0 63')
+    db.add_ecu_defines("NWM-Knoten", 'ENUM  "nein","ja"')            
+    db.add_signal_defines("LongName", 'STRING')
+    db.add_frame_defines("GenMsgDelayTime", 'INT 0 65535')
+    db.add_frame_defines("GenMsgNrOfRepetitions", 'INT 0 65535')
+    db.add_frame_defines("GenMsgStartValue", 'STRING')
+    db.add_frame_defines("GenMsgStartDelayTime", 'INT 0 65535')
+    db.add_frame_defines("GenMsgSendType",
+                         'ENUM  "cyclicX","spontanX","cyclicIfActiveX","spontanWithDelay","cyclicAndSpontanX","cyclicAndSpontanWithDelay","spontanWithRepitition","cyclicIfActiveAndSpontanWD","cyclicIfActiveFast","cyclicWithRepeatOnDemand","none"')
+
+    channel_name = get_element_name(cc, ns)
+    frame_triggers = pc.findall('.//' + ns + "CAN-FRAME-TRIGGERING")
+    for xml_frame_trigger in frame_triggers:
+        frame_counter += 1
+        logger.debug(" flexray_helper frame_counter is :"+str(frame_counter))
+        frame_name = get_element_name(xml_frame_trigger, ns)
+        arb_id = get_child(xml_frame_trigger, "IDENTIFIER", root_or_cache, ns)
+        arbitration_id = int(arb_id.text)
+        
+        ipdu_triggerings = get_children(xml_frame_trigger, "PDU-TRIGGERING", root_or_cache, ns)
+        
+        frame_size = int(find_children_by_path(xml_frame_trigger, "FRAME/FRAME-LENGTH", root_or_cache, ns)[0].text)
+        # for flexray,create the new frame struct object.
+        struct_frame = canmatrix.Frame(size = frame_size, arbitration_id = frame_counter)
+        struct_frame.name = frame_name
+        struct_frame.is_FlexrayFrame = False
+
+        struct_frame.arbitration_id = canmatrix.ArbitrationId(arbitration_id, extended=False)
+        struct_frame.slot_id = str(hex(arbitration_id))
+        '''net frame cycle time info is in the I-PDU , so it will be set in the i-pdu process part.'''
+        #struct_frame.cycle_time 
+        logger.debug(" can_helper frame name is :"+str(frame_name))
+        #db.add_frame(frame)
+        logger.debug(" can_helper frame_size is :"+str(frame_size))
+        for ipdu_triggering in ipdu_triggerings:
+            if ipdu_triggering is None:
+                logger.debug(" can_helper ipdu_triggering is none.")
+            else:
+                logger.debug(" can_helper ipdu_triggering name is :"+str(get_element_name(ipdu_triggering, ns)))
+            ipdu_triggering_name = get_element_name(ipdu_triggering, ns)
+            '''there are 3 type pdu, N-PDU, NM-PDU,I-SIGNAL-I-PDU. '''
+            pdu_type = find_descendant(ipdu_triggering, ns + "I-PDU-REF").attrib["DEST"]
+            if pdu_type.find("I-PDU") !=-1:
+                struct_frame.add_attribute("GenMsgSendType", "cyclicX")
+            else:
+                struct_frame.add_attribute("GenMsgSendType", "spontanX")
+            ipdu = get_child(ipdu_triggering, "I-PDU", root_or_cache, ns)
+            ipdu_name = get_element_name(ipdu, ns)
+            timing_spec = get_child(ipdu, "I-PDU-TIMING-SPECIFICATIONS", root_or_cache, ns)
+            cyclic_timing = get_child(timing_spec, "CYCLIC-TIMING", root_or_cache, ns)
+            time_period = get_child(cyclic_timing, "TIME-PERIOD", root_or_cache, ns)
+            value = get_child(time_period, "VALUE", root_or_cache, ns)
+            if value is not None:
+                #pdu_cycle_time_xml_path = "I-PDU-TIMING-SPECIFICATIONS/I-PDU-TIMING/TRANSMISSION-MODE-DECLARATION/TRANSMISSION-MODE-TRUE-TIMING/CYCLIC-TIMING/TIME-PERIOD/VALUE"
+                #pdu_cycle_time = ipdu.find('.//'+ns+pdu_cycle_time_xml_path)            
+                struct_frame.cycle_time = int(float_factory(value.text)*1000)
+            ipdu_length = int(find_descendant(ipdu, ns + "LENGTH").text)
+            pdu_port = get_child(ipdu_triggering, "I-PDU-PORT-REF", root_or_cache, ns)
+            pdu_port_type = get_child(ipdu_triggering, "I-PDU-PORT-REF", root_or_cache, ns).text.split("/")[-1]
+            recieve_ecu_name = None
+            if pdu_port_type.find("IN"):
+                recieve_ecu_name = get_element_name(pdu_port.getparent().getparent().getparent().getparent(), ns)                    
+            #logger.debug(" can_helper pdu_type is :"+str(pdu_type))
+            #logger.debug(" can_helper ipdu_length is :"+str(ipdu_length))
+            #logger.debug(" can_helper pdu_port_type is :"+str(pdu_port_type))
+            #logger.debug(" can_helper ipdu_name is :"+str(ipdu_name))
+            target_pdu = canmatrix.Pdu(name = ipdu_name, size=ipdu_length,pdu_type=pdu_type,
+                                       triggering_name = ipdu_triggering_name, port_type=pdu_port_type)
+            
+            sig_pdu_mappings = get_children(ipdu, "I-SIGNAL-TO-I-PDU-MAPPING", root_or_cache, ns)
+            
+            if sig_pdu_mappings is None or len(sig_pdu_mappings)==0:
+                logger.debug(" can_helper no I-SIGNAL-TO-I-PDU-MAPPING found under PDU:"+str(ipdu_name))
+            else:
+                get_signals(sig_pdu_mappings, struct_frame,target_pdu, recieve_ecu_name,root_or_cache, ns, None, float_factory)   
+            
+            isignal_in_sig_pdu_mappings = get_children(ipdu, "I-SIGNAL", root_or_cache, ns) 
+            for struct_signal in  target_pdu.signals:
+                struct_signal.pdu_name = ipdu_name
+                struct_signal.pdu_type = pdu_type
+                struct_signal.pdu_length = ipdu_length
+                struct_signal.pdu_portType = pdu_port_type
+                sig_group = target_pdu.get_signal_group_for_signal(str(struct_signal))
+                if sig_group is not None:
+                    struct_signal.signal_group = str(sig_group.name)
+            for isignal in  isignal_in_sig_pdu_mappings:
+                isignal_name = get_element_name(isignal, ns)
+                #logger.debug(" can_helper found signal under PDU is :"+str(isignal_name))                  
+            struct_frame.add_pdu(target_pdu)
+        db.add_frame(struct_frame)
+        if progress is not None:
+            progress.step()
+    return channel_name, db, frame_counter
+
+
+def decode_can_helper(root, root_or_cache, ns, float_factory, ignore_cluster_info, progress=None):
     found_matrixes = {}
     logger.debug("-------------decode_can_helper is excuted------------.")
     ccs = root.findall('.//' + ns + 'CAN-CLUSTER')
+    if progress is not None:
+        progress.start("decode_can", count_descendants(ccs, ns + "CAN-FRAME-TRIGGERING"))
     frame_counter = 0
     for cc in ccs:
-        speed = get_child(cc, "SPEED", root_or_cache, ns)
         physical_channels = cc.findall('.//' + ns + "CAN-PHYSICAL-CHANNEL")
         for pc in physical_channels:
-            db = canmatrix.CanMatrix()
-            db.is_flexray = False
-            db.add_ecu_defines("NWM-Stationsadresse", 'HEX 0 63')
-            db.add_ecu_defines("NWM-Knoten", 'ENUM  "nein","ja"')            
-            db.add_signal_defines("LongName", 'STRING')
-            db.add_frame_defines("GenMsgDelayTime", 'INT 0 65535')
-            db.add_frame_defines("GenMsgNrOfRepetitions", 'INT 0 65535')
-            db.add_frame_defines("GenMsgStartValue", 'STRING')
-            db.add_frame_defines("GenMsgStartDelayTime", 'INT 0 65535')
-            db.add_frame_defines("GenMsgSendType",
-                                 'ENUM  "cyclicX","spontanX","cyclicIfActiveX","spontanWithDelay","cyclicAndSpontanX","cyclicAndSpontanWithDelay","spontanWithRepitition","cyclicIfActiveAndSpontanWD","cyclicIfActiveFast","cyclicWithRepeatOnDemand","none"')
-
-            channel_name = get_element_name(cc, ns)
+            channel_name, db, frame_counter = decode_can_physical_channel(
+                cc, pc, root_or_cache, ns, float_factory, frame_counter, progress)
             found_matrixes[channel_name] = db
-            frame_triggers = pc.findall('.//' + ns + "CAN-FRAME-TRIGGERING")
-            for xml_frame_trigger in frame_triggers:
-                frame_counter += 1
-                logger.debug(" flexray_helper frame_counter is :"+str(frame_counter))
-                frame_name = get_element_name(xml_frame_trigger, ns)
-                arb_id = get_child(xml_frame_trigger, "IDENTIFIER", root_or_cache, ns)
-                arbitration_id = int(arb_id.text)
-                
-                ipdu_triggerings = get_children(xml_frame_trigger, "PDU-TRIGGERING", root_or_cache, ns)
-                
-                network_endpoints = pc.findall('.//' + ns + "NETWORK-ENDPOINT")
-                frame_size = int(find_children_by_path(xml_frame_trigger, "FRAME/FRAME-LENGTH", root_or_cache, ns)[0].text)
-                # for flexray,create the new frame struct object.
-                struct_frame = canmatrix.Frame(size = frame_size, arbitration_id = frame_counter)
-                struct_frame.name = frame_name
-                struct_frame.is_FlexrayFrame = False
-
-                struct_frame.arbitration_id = canmatrix.ArbitrationId(arbitration_id, extended=False)
-                struct_frame.slot_id = str(hex(arbitration_id))
-                '''net frame cycle time info is in the I-PDU , so it will be set in the i-pdu process part.'''
-                #struct_frame.cycle_time 
-                logger.debug(" can_helper frame name is :"+str(frame_name))
-                #db.add_frame(frame)
-                logger.debug(" can_helper frame_size is :"+str(frame_size))
-                for ipdu_triggering in ipdu_triggerings:
-                    if ipdu_triggering is None:
-                        logger.debug(" can_helper ipdu_triggering is none.")
-                    else:
-                        logger.debug(" can_helper ipdu_triggering name is :"+str(get_element_name(ipdu_triggering, ns)))
-                    ipdu_triggering_name = get_element_name(ipdu_triggering, ns)
-                    '''there are 3 type pdu, N-PDU, NM-PDU,I-SIGNAL-I-PDU. '''
-                    pdu_type = ipdu_triggering.find('.//'+ns+"I-PDU-REF").attrib["DEST"]
-                    if pdu_type.find("I-PDU") !=-1:
-                        struct_frame.add_attribute("GenMsgSendType", "cyclicX")
-                    else:
-                        struct_frame.add_attribute("GenMsgSendType", "spontanX")
-                    ipdu = get_child(ipdu_triggering, "I-PDU", root_or_cache, ns)
-                    ipdu_name = get_element_name(ipdu, ns)
-                    timing_spec = get_child(ipdu, "I-PDU-TIMING-SPECIFICATIONS", root_or_cache, ns)
-                    cyclic_timing = get_child(timing_spec, "CYCLIC-TIMING", root_or_cache, ns)
-                    time_period = get_child(cyclic_timing, "TIME-PERIOD", root_or_cache, ns)
-                    value = get_child(time_period, "VALUE", root_or_cache, ns)
-                    if value is not None:
-                        #pdu_cycle_time_xml_path = "I-PDU-TIMING-SPECIFICATIONS/I-PDU-TIMING/TRANSMISSION-MODE-DECLARATION/TRANSMISSION-MODE-TRUE-TIMING/CYCLIC-TIMING/TIME-PERIOD/VALUE"
-                        #pdu_cycle_time = ipdu.find('.//'+ns+pdu_cycle_time_xml_path)            
-                        struct_frame.cycle_time = int(float_factory(value.text)*1000)
-                    ipdu_length = int(ipdu.find('.//'+ns+"LENGTH").text)
-                    pdu_port = get_child(ipdu_triggering, "I-PDU-PORT-REF", root_or_cache, ns)
-                    pdu_port_type = get_child(ipdu_triggering, "I-PDU-PORT-REF", root_or_cache, ns).text.split("/")[-1]
-                    recieve_ecu_name = None
-                    if pdu_port_type.find("IN"):
-                        recieve_ecu_name = get_element_name(pdu_port.getparent().getparent().getparent().getparent(), ns)                    
-                    #logger.debug(" can_helper pdu_type is :"+str(pdu_type))
-                    #logger.debug(" can_helper ipdu_length is :"+str(ipdu_length))
-                    #logger.debug(" can_helper pdu_port_type is :"+str(pdu_port_type))
-                    #logger.debug(" can_helper ipdu_name is :"+str(ipdu_name))
-                    target_pdu = canmatrix.Pdu(name = ipdu_name, size=ipdu_length,pdu_type=pdu_type,
-                                               triggering_name = ipdu_triggering_name, port_type=pdu_port_type)
-                    
-                    sig_pdu_mappings = get_children(ipdu, "I-SIGNAL-TO-I-PDU-MAPPING", root_or_cache, ns)
-                    
-                    if sig_pdu_mappings is None or len(sig_pdu_mappings)==0:
-                        logger.debug(" can_helper no I-SIGNAL-TO-I-PDU-MAPPING found under PDU:"+str(ipdu_name))
-                    else:
-                        get_signals(sig_pdu_mappings, struct_frame,target_pdu, recieve_ecu_name,root_or_cache, ns, None, float_factory)   
-                    
-                    isignal_in_sig_pdu_mappings = get_children(ipdu, "I-SIGNAL", root_or_cache, ns) 
-                    for struct_signal in  target_pdu.signals:
-                        struct_signal.pdu_name = ipdu_name
-                        struct_signal.pdu_type = pdu_type
-                        struct_signal.pdu_length = ipdu_length
-                        struct_signal.pdu_portType = pdu_port_type
-                        sig_group = target_pdu.get_signal_group_for_signal(str(struct_signal))
-                        if sig_group is not None:
-                            struct_signal.signal_group = str(sig_group.name)
-                    for isignal in  isignal_in_sig_pdu_mappings:
-                        isignal_name = get_element_name(isignal, ns)
-                        #logger.debug(" can_helper found signal under PDU is :"+str(isignal_name))                  
-                    struct_frame.add_pdu(target_pdu)
-                db.add_frame(struct_frame)
     return found_matrixes
 
-def load(file, **options):
-    # type: (typing.IO, **typing.Any) -> typing.Dict[str, canmatrix.CanMatrix]
+def build_search_point(file, use_ar_xpath, progress=None):
+    # type: (typing.Any, bool, typing.Optional[canmatrix.Progress]) -> typing.Tuple[_Element, str, _DocRoot]
+    """Parse the whole xml and create the search point for resolving references.
 
-    global xml_element_cache
-    xml_element_cache = dict()
-    global pdu_frame_mapping
-    pdu_frame_mapping = {}
-    global signal_rxs
-    signal_rxs = {}
-
-    float_factory = options.get("float_factory", default_float_factory)  # type: typing.Callable
-    ignore_cluster_info = options.get("arxmlIgnoreClusterInfo", False)
-    use_ar_xpath = options.get("arxmlUseXpath", False)
-
-    decode_ethernet = options.get("decode_ethernet", False)
-    decode_flexray = options.get("decode_flexray", False)
-
-    result = {}
+    :param progress: Progress to report the phases "parse" and "index" to
+    :return: root element, namespace and search point (ArTree or top level element if use_ar_xpath)
+    """
     logger.debug("Read arxml ...")
+    if progress is not None:
+        progress.start("parse", 1)
     tree = lxml.etree.parse(file)
+    if progress is not None:
+        progress.step()
 
     root = tree.getroot()  # type: _Element
     logger.debug(" Done\n")
 
     ns = "{" + tree.xpath('namespace-uri(.)') + "}"  # type: str
     logger.debug("current ns value is : "+ns)
-    nsp = tree.xpath('namespace-uri(.)')
 
     top_level_packages = root.find('./' + ns + 'TOP-LEVEL-PACKAGES')
 
@@ -1084,13 +1286,297 @@ def load(file, **options):
     logger.debug("Build arTree ...")
 
     if use_ar_xpath:
-        search_point = top_level_packages  # type: typing.Union[_Element, ArTree]
+        search_point = top_level_packages  # type: _DocRoot
     else:
+        if progress is not None:
+            progress.start("index", 1)
         ar_tree = ArTree()
-        fill_tree_from_xml(top_level_packages, ar_tree, ns)
+        ar_tree.path_index = {}
+        fill_tree_from_xml(top_level_packages, ar_tree, ns, ar_tree.path_index)
         search_point = ar_tree
+        if progress is not None:
+            progress.step()
         logger.debug("use ar_tree structure object filled by etree root as the search point.")
     logger.debug(" Done\n")
+    return root, ns, search_point
+
+
+def reset_decode_state(options):  # type: (typing.Dict[str, typing.Any]) -> None
+    """Reset the module level caches before decoding a new document."""
+    global xml_element_cache
+    xml_element_cache = dict()
+    global pdu_frame_mapping
+    pdu_frame_mapping = {}
+    global signal_rxs
+    signal_rxs = {}
+    global child_lookup_cache
+    child_lookup_cache = dict() if options.get("arxmlScopedLookup", False) else None
+
+
+def parse_document(file, options, progress=None):
+    # type: (typing.Any, typing.Dict[str, typing.Any], typing.Optional[canmatrix.Progress]) -> typing.Tuple[_Element, str, _DocRoot]
+    """Parse the arxml as configured by the load options, return root element, namespace and search point."""
+    if options.get("arxmlStreaming", False):
+        logger.debug("Read arxml streaming and build path index ...")
+        if progress is not None:
+            progress.start("parse", 1)
+        root, ns, search_point = parse_streaming(file)
+        if progress is not None:
+            progress.step()
+        logger.debug(" Done\n")
+        return root, ns, search_point
+    return build_search_point(file, options.get("arxmlUseXpath", False), progress)
+
+
+def apply_numeric_mode(result, options):  # type: (typing.Mapping[str, canmatrix.CanMatrix], typing.Dict[str, typing.Any]) -> None
+    """Set the numeric mode of the load option numericMode ("decimal", "float" or "fraction") in all matrices."""
+    numeric_mode = options.get("numericMode")
+    if numeric_mode is not None:
+        for db in result.values():
+            db.set_numeric_mode(numeric_mode)
+
+
+# format version of the model cache files, increase it if the pickled model classes change incompatibly
+cache_format_version = 1
+cache_magic = b"CANMATRIX-ARXML-CACHE"
+# load options which do not change the loaded model
+cache_ignored_options = ("arxmlCacheDir", "arxmlKeepTree", "workers", "progress", "cancelled")
+
+
+def cache_option_key(options):  # type: (typing.Dict[str, typing.Any]) -> str
+    """Stable text of the load options which change the loaded model."""
+    items = []
+    for name in sorted(options):
+        if name in cache_ignored_options:
+            continue
+        value = options[name]
+        if callable(value):
+            value = "{}.{}".format(getattr(value, "__module__", ""), getattr(value, "__name__", repr(value)))
+        items.append("{}={!r}".format(name, value))
+    return ";".join(items)
+
+
+def content_hash(file):  # type: (typing.Any) -> typing.Optional[str]
+    """sha1 of the content of a file name or a seekable binary file object, None if it can not be read twice."""
+    digest = hashlib.sha1()
+    name = getattr(file, "name", None)
+    if hasattr(file, "read") and isinstance(name, basestring) and os.path.isfile(name):
+        # hash the file on disk in binary mode, file may be opened in text mode
+        file = name
+    if hasattr(file, "read"):
+        try:
+            start = file.tell()
+            while True:
+                chunk = file.read(1 << 20)
+                if not chunk:
+                    break
+                if not isinstance(chunk, bytes):
+                    # text mode file object without a file on disk, not cached
+                    file.seek(start)
+                    return None
+                digest.update(chunk)
+            file.seek(start)
+        except (AttributeError, IOError, OSError, ValueError):
+            return None
+    else:
+        with open(file, "rb") as file_object:
+            for chunk in iter(lambda: file_object.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_cache_path(file, options):  # type: (typing.Any, typing.Dict[str, typing.Any]) -> typing.Optional[str]
+    """Cache file of the document and load options in the directory of the load option arxmlCacheDir."""
+    cache_dir = options.get("arxmlCacheDir")
+    if not cache_dir or options.get("arxmlKeepTree", False):
+        return None
+    source = file if not hasattr(file, "read") else getattr(file, "name", None)
+    if not isinstance(source, basestring):
+        return None
+    key = hashlib.sha1((os.path.abspath(source) + "|" + cache_option_key(options)).encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, key + ".arxml-cache")
+
+
+def cache_header(file, options):  # type: (typing.Any, typing.Dict[str, typing.Any]) -> typing.Optional[typing.Dict[str, typing.Any]]
+    """Everything a cache file must have been written for: document content, options and versions."""
+    document_hash = content_hash(file)
+    if document_hash is None:
+        return None
+    return {
+        "format": cache_format_version,
+        "canmatrix": canmatrix.__version__,
+        "document": document_hash,
+        "options": cache_option_key(options),
+    }
+
+
+def read_cache(cache_path, header):  # type: (str, typing.Dict[str, typing.Any]) -> typing.Optional[ArxmlLoadResult]
+    """Return the cached load result if the cache file was written for header, else None."""
+    if not os.path.isfile(cache_path):
+        return None
+    try:
+        with open(cache_path, "rb") as cache_file:
+            if cache_file.read(len(cache_magic)) != cache_magic or pickle.load(cache_file) != header:
+                logger.info("arxml cache %s is outdated", cache_path)
+                return None
+            return pickle.load(cache_file)
+    except Exception as error:  # the cache is only an optimization, any broken cache file is a miss
+        logger.info("arxml cache %s can not be read: %s", cache_path, error)
+        return None
+
+
+def write_cache(cache_path, header, result):  # type: (str, typing.Dict[str, typing.Any], ArxmlLoadResult) -> None
+    """Write result to the cache file, the file is replaced at once so readers never see a partial file."""
+    cached = ArxmlLoadResult(result)
+    cached.namespace = result.namespace
+    cache_dir = os.path.dirname(cache_path)
+    try:
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+        handle, temp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(handle, "wb") as cache_file:
+            cache_file.write(cache_magic)
+            pickle.dump(header, cache_file, pickle.HIGHEST_PROTOCOL)
+            pickle.dump(cached, cache_file, pickle.HIGHEST_PROTOCOL)
+        getattr(os, "replace", os.rename)(temp_path, cache_path)
+    except (IOError, OSError, pickle.PicklingError) as error:
+        logger.warning("arxml cache %s not written: %s", cache_path, error)
+
+
+# load options a decode worker needs to parse the document itself, the progress callbacks stay in the loading process
+decode_worker_options = ("float_factory", "arxmlStreaming", "arxmlUseXpath", "arxmlScopedLookup")
+# document of the decode worker process: root element, namespace, search point and float factory
+decode_worker_document = None  # type: typing.Optional[typing.Tuple[_Element, str, _DocRoot, _FloatFactory]]
+# largest file (bytes) decoded in parallel by workers which are not forked: every spawned worker parses the
+# whole document again, N workers hold N trees (about 10 times the file size each) and take at least the
+# time of one full parse. Larger files are decoded sequentially, None: no limit
+spawn_parse_limit = 16 * 1024 * 1024  # type: typing.Optional[int]
+
+
+def default_start_method():  # type: () -> str
+    """Start method of new worker processes, without fixing it like multiprocessing.get_start_method does."""
+    if not hasattr(multiprocessing, "get_start_method"):
+        return "spawn" if os.name == "nt" else "fork"
+    # the first method is the default one
+    return multiprocessing.get_start_method(allow_none=True) or multiprocessing.get_all_start_methods()[0]
+
+
+def init_decode_worker(file, options):  # type: (str, typing.Dict[str, typing.Any]) -> None
+    """Pool initializer, parse the document once per worker process.
+
+    Forked workers inherit the document already parsed by load and do not parse again.
+    """
+    global decode_worker_document
+    if decode_worker_document is None:
+        reset_decode_state(options)
+        root, ns, search_point = parse_document(file, options)
+        decode_worker_document = (root, ns, search_point, options.get("float_factory", default_float_factory))
+
+
+def list_channel_jobs(root, ns):  # type: (_Element, str) -> typing.List[typing.Tuple[str, int, int, int]]
+    """List the physical channels as (bus type, cluster index, channel index, frame counter) in decoding order.
+
+    The frame counter is the one the sequential helpers would have reached before the channel.
+    """
+    jobs = []
+    frame_counter = 0
+    for cluster_index, cc in enumerate(root.findall('.//' + ns + 'CAN-CLUSTER')):
+        for channel_index, pc in enumerate(cc.findall('.//' + ns + "CAN-PHYSICAL-CHANNEL")):
+            jobs.append(("CAN", cluster_index, channel_index, frame_counter))
+            frame_counter += len(pc.findall('.//' + ns + "CAN-FRAME-TRIGGERING"))
+    frame_counter = 0
+    for cluster_index, fc in enumerate(root.findall('.//' + ns + 'FLEXRAY-CLUSTER')):
+        for channel_index, pc in enumerate(fc.findall('.//' + ns + "FLEXRAY-PHYSICAL-CHANNEL")):
+            jobs.append(("FLEXRAY", cluster_index, channel_index, frame_counter))
+            frame_counter += 2 * len(pc.findall('.//' + ns + "FLEXRAY-FRAME-TRIGGERING"))
+    return jobs
+
+
+def decode_channel_job(job):  # type: (typing.Tuple[str, int, int, int]) -> typing.Tuple[str, canmatrix.CanMatrix]
+    """Decode one physical channel of the worker document, see list_channel_jobs."""
+    bus_type, cluster_index, channel_index, frame_counter = job
+    root, ns, search_point, float_factory = decode_worker_document
+    cluster = root.findall('.//' + ns + bus_type + '-CLUSTER')[cluster_index]
+    pc = cluster.findall('.//' + ns + bus_type + "-PHYSICAL-CHANNEL")[channel_index]
+    if bus_type == "CAN":
+        channel_name, db, _ = decode_can_physical_channel(cluster, pc, search_point, ns, float_factory, frame_counter)
+    else:
+        channel_name, db, _ = decode_flexray_physical_channel(pc, search_point, ns, float_factory, frame_counter)
+    return channel_name, db
+
+
+def decode_channels_parallel(file, root, ns, search_point, float_factory, workers, options, progress=None):
+    # type: (str, _Element, str, _DocRoot, _FloatFactory, int, typing.Dict[str, typing.Any], typing.Optional[canmatrix.Progress]) -> typing.Dict[str, canmatrix.CanMatrix]
+    """Decode all CAN and FlexRay physical channels in a process pool.
+
+    The results are merged in the order of the sequential helpers, so the returned dict is the same.
+    The phase "decode" of progress counts the decoded channels. At most one channel per worker is
+    submitted, a cancel lets the submitted channels complete and submits no more.
+    """
+    global decode_worker_document
+    jobs = list_channel_jobs(root, ns)
+    worker_options = {key: options[key] for key in decode_worker_options if key in options}
+    processes = min(workers, len(jobs))
+    logger.debug("decode %d physical channels with %d workers", len(jobs), processes)
+    if progress is not None:
+        progress.start("decode", len(jobs))
+    decode_worker_document = (root, ns, search_point, float_factory)
+    pool = multiprocessing.Pool(processes, init_decode_worker, (file, worker_options))
+    try:
+        remaining = collections.deque(jobs)
+        running = collections.deque()  # type: typing.Deque[typing.Any]
+        decoded = []
+        while remaining or running:
+            while remaining and len(running) < processes:
+                running.append(pool.apply_async(decode_channel_job, (remaining.popleft(),)))
+            decoded.append(running.popleft().get())
+            if progress is not None:
+                progress.step()
+    finally:
+        pool.close()
+        pool.join()
+        decode_worker_document = None
+    found_matrixes = {}
+    for channel_name, db in decoded:
+        found_matrixes[channel_name] = db
+    return found_matrixes
+
+
+def load(file, **options):
+    # type: (typing.IO, **typing.Any) -> ArxmlLoadResult
+
+    cache_path = get_cache_path(file, options)
+    header = cache_header(file, options) if cache_path is not None else None
+    if header is not None:
+        cached = read_cache(cache_path, header)
+        if cached is not None:
+            logger.info("arxml loaded from cache %s", cache_path)
+            return cached
+
+    reset_decode_state(options)
+    progress = canmatrix.Progress.from_options(options)
+
+    float_factory = options.get("float_factory", default_float_factory)  # type: typing.Callable
+    ignore_cluster_info = options.get("arxmlIgnoreClusterInfo", False)
+
+    decode_ethernet = options.get("decode_ethernet", False)
+    decode_flexray = options.get("decode_flexray", False)
+
+    workers = options.get("workers", 1)
+    if workers > 1 and hasattr(file, "read"):
+        logger.info("parallel decoding needs a file name, the workers can not share a file object. decode sequential.")
+        workers = 1
+    if workers > 1 and spawn_parse_limit is not None and default_start_method() != "fork" and \
+            os.path.getsize(file) > spawn_parse_limit:
+        logger.warning("%s is too large to be parsed again by every %s worker, decode sequential.",
+                       file, default_start_method())
+        workers = 1
+
+    result = ArxmlLoadResult()
+    root, ns, search_point = parse_document(file, options, progress)
+    result.namespace = ns
+    if options.get("arxmlKeepTree", False):
+        result.tree = root.getroottree()
 
     if isinstance(search_point, ArTree):
         com_module = get_cached_element_by_path(search_point, "ActiveEcuC/Com")
@@ -1100,13 +1586,24 @@ def load(file, **options):
         logger.debug("search_point is not ArTree instance, use get_element_by_path to get com_module.")
     if com_module is not None:
         logger.info("seems to be a ECUC arxml. Very limited support for extracting canmatrix.")
-        return extract_cm_from_ecuc(com_module, search_point, ns)
-
-    result.update(decode_can_helper(root, search_point, ns, float_factory, ignore_cluster_info))
+        result.update(extract_cm_from_ecuc(com_module, search_point, ns))
+        apply_numeric_mode(result, options)
+        if header is not None:
+            write_cache(cache_path, header, result)
+        return result
+
+    if workers > 1:
+        result.update(decode_channels_parallel(
+            file, root, ns, search_point, float_factory, workers, options, progress))
+    else:
+        result.update(decode_can_helper(root, search_point, ns, float_factory, ignore_cluster_info, progress))
 
-    result.update(decode_flexray_helper(root, search_point, ns, float_factory))
+        result.update(decode_flexray_helper(root, search_point, ns, float_factory, progress))
 
     if decode_ethernet:
-        result.update(decode_ethernet_helper(root, search_point, ns, float_factory))
+        result.update(decode_ethernet_helper(root, search_point, ns, float_factory, progress))
 
+    apply_numeric_mode(result, options)
+    if header is not None:
+        write_cache(cache_path, header, result)
     return result
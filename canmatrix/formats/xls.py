@@ -30,6 +30,7 @@ import logging
 import typing
 from builtins import *
 
+import attr
 import past.builtins
 import xlrd
 import xlwt
@@ -324,7 +325,8 @@ def parse_value_name_column(value_name, value_str, signal_size, float_factory):
 def read_additional_signal_attributes(signal, attribute_name, attribute_value):
     if not attribute_name.startswith("signal"):
         return
-    if attribute_name.replace("signal.", "") in vars(signal):
+    field_name = attribute_name.replace("signal.", "")
+    if field_name in attr.fields_dict(type(signal)) or field_name in signal.lazy_fields:
         command_str = attribute_name + "="
         command_str += str(attribute_value)
         if len(str(attribute_value)) > 0:
@@ -130,19 +130,20 @@ def get_signal(db, sig, motorola_bit_format):
     else:
         front_array.append("m")
 
+    factor = sig.scaling("float")[0]
     # is a unit defined for signal?
     if sig.unit.strip():
         # factor not 1.0 ?
-        if float(sig.factor) != 1:
-            back_array.append("%g" % float(sig.factor) + "  " + sig.unit)
+        if factor != 1:
+            back_array.append("%g" % factor + "  " + sig.unit)
         # factor == 1.0
         else:
             back_array.append(sig.unit)
     # no unit defined
     else:
         # factor not 1.0 ?
-        if float(sig.factor) != 1:
-            back_array.append("%g -" % float(sig.factor))
+        if factor != 1:
+            back_array.append("%g -" % factor)
         # factor == 1.0
         else:
             back_array.append("")
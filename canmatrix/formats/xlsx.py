@@ -26,6 +26,7 @@
 from __future__ import absolute_import, division, print_function
 
 import logging
+import os
 import typing
 from builtins import *
 
@@ -53,8 +54,9 @@ sty_sender_green = 0
 sty_sender_green_first_frame = 0
 
 
-def write_ecu_matrix(ecu_list, signal, frame, worksheet, row, col, first_frame):
-    # type: (typing.Sequence[str], typing.Optional[canmatrix.Signal], canmatrix.Frame, xlsxwriter.workbook.Worksheet, int, int, xlsxwriter.workbook.Format) -> int
+def get_ecu_styles(col, count, first_frame):
+    # type: (int, int, xlsxwriter.workbook.Format) -> typing.Tuple[typing.List[xlsxwriter.workbook.Format], typing.List[xlsxwriter.workbook.Format]]
+    """Return the styles of count ECU columns starting at column col as (receiver/unused styles, sender styles)."""
     # first-frame - style with borders:
     if first_frame == sty_first_frame:
         norm = sty_first_frame
@@ -67,37 +69,225 @@ def write_ecu_matrix(ecu_list, signal, frame, worksheet, row, col, first_frame):
         sender = sty_sender
         norm_green = sty_green
         sender_green = sty_sender_green
-
-    # iterate over ECUs:
-    for ecu in ecu_list:
-        # every second ECU with other style
-        if col % 2 == 0:
-            loc_style = norm
-            loc_style_sender = sender
-        # every second ECU with other style
-        else:
-            loc_style = norm_green
-            loc_style_sender = sender_green
-        # write "s" "r" "r/s" if signal is sent, received or send and received by ECU
-        if signal is not None and ecu in signal.receivers and ecu in frame.transmitters:
-            worksheet.write(row, col, "r/s", loc_style_sender)
-        elif signal is not None and ecu in signal.receivers:
-            worksheet.write(row, col, "r", loc_style)
-        elif ecu in frame.transmitters:
-            worksheet.write(row, col, "s", loc_style_sender)
+    # every second ECU with other style
+    norm_styles = [norm if (col + index) % 2 == 0 else norm_green for index in range(count)]
+    sender_styles = [sender if (col + index) % 2 == 0 else sender_green for index in range(count)]
+    return norm_styles, sender_styles
+
+
+def get_ecu_columns(ecu_list):  # type: (typing.Sequence[str]) -> typing.Dict[str, typing.List[int]]
+    """Map each ECU name to its indexes in ecu_list."""
+    ecu_columns = {}  # type: typing.Dict[str, typing.List[int]]
+    for index, ecu in enumerate(ecu_list):
+        ecu_columns.setdefault(ecu, []).append(index)
+    return ecu_columns
+
+
+def get_frame_ecu_matrix(ecu_list, frame, ecu_styles):
+    # type: (typing.Sequence[str], canmatrix.Frame, typing.Tuple[typing.List[xlsxwriter.workbook.Format], typing.List[xlsxwriter.workbook.Format]]) -> typing.Tuple[typing.List[str], typing.List[xlsxwriter.workbook.Format]]
+    """Return cells and styles of the ECU matrix of the frame without any receivers.
+
+    The style of a cell only depends on its column and the transmitters of the frame, so the styles are the same
+    for all signals of the frame.
+    """
+    norm_styles, sender_styles = ecu_styles
+    transmitters = set(frame.transmitters)
+    cells = []  # type: typing.List[str]
+    styles = []  # type: typing.List[xlsxwriter.workbook.Format]
+    for index, ecu in enumerate(ecu_list):
+        if ecu in transmitters:
+            cells.append("s")
+            styles.append(sender_styles[index])
         else:
-            worksheet.write(row, col, "", loc_style)
-        col += 1
-    # loop over ECUs ends here
-    return col
+            cells.append("")
+            styles.append(norm_styles[index])
+    return cells, styles
+
+
+def add_ecu_receivers(frame_cells, ecu_columns, receivers):
+    # type: (typing.Sequence[str], typing.Mapping[str, typing.Sequence[int]], typing.Iterable[str]) -> typing.List[str]
+    """Return a copy of the frame ECU matrix cells with "r" / "r/s" for the receiving ECUs."""
+    cells = list(frame_cells)
+    for receiver in receivers:
+        for index in ecu_columns.get(receiver, ()):
+            cells[index] = "r/s" if frame_cells[index] == "s" else "r"
+    return cells
+
+
+def get_ecu_matrix(ecu_list, signal, frame, ecu_styles):
+    # type: (typing.Sequence[str], typing.Optional[canmatrix.Signal], canmatrix.Frame, typing.Tuple[typing.List[xlsxwriter.workbook.Format], typing.List[xlsxwriter.workbook.Format]]) -> typing.Tuple[typing.List[str], typing.List[xlsxwriter.workbook.Format]]
+    """Return cells and styles of the ECU matrix, ecu_styles as returned by get_ecu_styles."""
+    # write "s" "r" "r/s" if signal is sent, received or send and received by ECU
+    cells, styles = get_frame_ecu_matrix(ecu_list, frame, ecu_styles)
+    if signal is not None:
+        cells = add_ecu_receivers(cells, get_ecu_columns(ecu_list), signal.receivers)
+    return cells, styles
+
+
+def write_ecu_matrix(ecu_list, signal, frame, worksheet, row, col, first_frame):
+    # type: (typing.Sequence[str], typing.Optional[canmatrix.Signal], canmatrix.Frame, xlsxwriter.workbook.Worksheet, int, int, xlsxwriter.workbook.Format) -> int
+    cells, styles = get_ecu_matrix(ecu_list, signal, frame, get_ecu_styles(col, len(ecu_list), first_frame))
+    write_styled_line(worksheet, row, cells, styles, col)
+    return col + len(cells)
 
 
 def write_excel_line(worksheet, row, col, row_array, style):
     # type: (xlsxwriter.workbook.Worksheet, int, int, typing.Sequence[typing.Any], xlsxwriter.workbook.Format) -> int
-    for item in row_array:
-        worksheet.write(row, col, item, style)
-        col += 1
-    return col
+    worksheet.write_row(row, col, row_array, style)
+    return col + len(row_array)
+
+
+def write_styled_line(worksheet, row, row_array, styles, col=0):
+    # type: (xlsxwriter.workbook.Worksheet, int, typing.Sequence[typing.Any], typing.Sequence[xlsxwriter.workbook.Format], int) -> None
+    """Write row_array starting at column col, styles has one style per cell.
+
+    Each run of cells with the same style is handed to the worksheet with one write_row call, single empty cells
+    (as in the ECU matrix with its alternating column styles) go straight to write_blank.
+    """
+    start = 0
+    for end in range(1, len(row_array) + 1):
+        if end == len(row_array) or styles[end] is not styles[start]:
+            if end - start == 1 and row_array[start] == "":
+                worksheet.write_blank(row, col + start, "", styles[start])
+            else:
+                worksheet.write_row(row, col + start, row_array[start:end], styles[start])
+            start = end
+
+
+def get_signal_rows(db, ecu_list, head_start, additional_frame_start, additional_frame_columns,
+                    additional_signal_columns, motorola_bit_format, values_in_seperate_lines, progress=None):
+    # type: (canmatrix.CanMatrix, typing.Sequence[str], int, int, typing.Sequence[str], typing.Sequence[str], str, bool, typing.Optional[canmatrix.Progress]) -> typing.Iterator[typing.Tuple[typing.List[typing.Any], typing.List[xlsxwriter.workbook.Format], bool]]
+    """Generate the rows of the signal sheet of db in sheet order.
+
+    Every row is complete from column 0 on and yielded as (cells, styles, outline), outline is True for the rows
+    which are grouped below the first row of their frame. No cell is written twice, so the rows can be streamed
+    to a constant_memory workbook.
+    A step of progress is counted after the rows of every frame.
+    """
+    frame_hash = {}
+    logger.debug("DEBUG: Length of db.frames is %d", len(db.frames))
+    for frame in db.frames:
+        if frame.is_complex_multiplexed:
+            logger.error(
+                "Export complex multiplexers is not supported - frame %s might be uncomplete", frame.name)
+        frame_hash[int(frame.arbitration_id.id)] = frame
+
+    # the ECU matrix styles only depend on the column and on first/consecutive row of a frame
+    first_row_ecu_styles = get_ecu_styles(head_start, len(ecu_list), sty_first_frame)
+    ecu_styles = get_ecu_styles(head_start, len(ecu_list), sty_norm)
+    ecu_columns = get_ecu_columns(ecu_list)
+
+    # iterate over the frames
+    for idx in sorted(frame_hash.keys()):
+        frame = frame_hash[idx]
+        frame_style = sty_first_frame
+        pdu_hash = {}
+        for pdu in frame.pdus:
+            pdu_hash[pdu.name] = pdu
+
+        # set style for first line with border
+        signal_style = sty_first_frame
+
+        # everything which only depends on the frame is computed once per frame
+        frame_info = canmatrix.formats.xls_common.get_frame_info(db, frame)
+        additional_frame_info = [frame.attribute(
+            additional, default="") for additional in additional_frame_columns]
+        frame_ecu_cells, first_row_ecu_cell_styles = get_frame_ecu_matrix(ecu_list, frame, first_row_ecu_styles)
+        _, ecu_cell_styles = get_frame_ecu_matrix(ecu_list, frame, ecu_styles)
+
+        # iterate over pdus
+        for pdu_idx in sorted(pdu_hash.keys()):
+            pdu = pdu_hash[pdu_idx]
+            # sort signals:
+            sig_hash = {}
+            for sig in pdu.signals:
+                sig_hash["%02d" % int(sig.get_startbit()) + sig.name] = sig
+
+            frame_row = frame_info + canmatrix.formats.xls_common.get_pdu_info(db, pdu)
+            if len(sig_hash) == 0:
+                # pdu without signals, one line with frame and pdu info only
+                cells = frame_row + ["" for _ in range(len(frame_row), head_start)] + frame_ecu_cells
+                cells += ["" for _ in range(len(cells), additional_frame_start)]
+                cells += additional_frame_info
+                cells += ["" for _ in additional_signal_columns]
+                styles = [frame_style] * head_start
+                styles += first_row_ecu_cell_styles if frame_style == sty_first_frame else ecu_cell_styles
+                styles += [frame_style] * (len(cells) - len(styles))
+                yield cells, styles, frame_style != sty_first_frame
+                signal_style = sty_white
+                frame_style = sty_white
+
+            # iterate over signals
+            for sig_idx in sorted(sig_hash.keys()):
+                sig = sig_hash[sig_idx]
+
+                # if not first Signal in Frame, set style
+                if signal_style != sty_first_frame:
+                    signal_style = sty_norm
+
+                (front_row, back_row) = canmatrix.formats.xls_common.get_signal(
+                    db, sig, motorola_bit_format)
+                ecu_cells = add_ecu_receivers(frame_ecu_cells, ecu_columns, sig.receivers)
+
+                # valuetable available?
+                if len(sig.values) > 0 and not values_in_seperate_lines:
+                    value_style = signal_style
+                    back_row += additional_frame_info
+                    for item in additional_signal_columns:
+                        back_row.append(getattr(sig, item, ""))
+                    # iterate over values in valuetable
+                    for val in sorted(sig.values.keys()):
+                        # no min/max here, because min/max has same col as values...
+                        cells = frame_row + front_row + ecu_cells + [val, sig.values[val]] + back_row
+                        styles = [frame_style] * len(frame_row) + [signal_style] * len(front_row)
+                        styles += first_row_ecu_cell_styles if frame_style == sty_first_frame else ecu_cell_styles
+                        styles += [value_style] * 2 + [signal_style] * len(back_row)
+                        yield cells, styles, frame_style != sty_first_frame
+                        # set style to normal - without border
+                        signal_style = sty_white
+                        frame_style = sty_white
+                        value_style = sty_norm
+                    # loop over values ends here
+                # no valuetable available
+                else:
+                    if float(sig.min) != 0 or float(sig.max) != 1.0:
+                        # type: ignore
+                        back_row.insert(0, str("%g..%g" % (sig.min, sig.max)))
+                    else:
+                        back_row.insert(0, "")
+                    back_row.insert(0, "")
+                    if len(sig.values) > 0:
+                        back_row[0] = "\n".join(["{}: {}".format(a, b) for (a, b) in sig.values.items()])
+                    back_row += additional_frame_info
+                    for item in additional_signal_columns:
+                        back_row.append(getattr(sig, item, ""))
+                    cells = frame_row + front_row + ecu_cells + back_row
+                    styles = [frame_style] * len(frame_row) + [signal_style] * len(front_row)
+                    styles += first_row_ecu_cell_styles if frame_style == sty_first_frame else ecu_cell_styles
+                    styles += [signal_style] * len(back_row)
+                    yield cells, styles, frame_style != sty_first_frame
+                    # set style to normal - without border
+                    signal_style = sty_white
+                    frame_style = sty_white
+                # loop over signals ends here
+        # loop over pdus ends here
+        if progress is not None:
+            progress.step()
+    # loop over frames ends here
+
+
+def discard_workbook(workbook):  # type: (xlsxwriter.Workbook) -> None
+    """Drop an unfinished workbook without writing it, remove the row data temp files of constant_memory."""
+    for worksheet in workbook.worksheets():
+        if getattr(worksheet, "row_data_filename", None) is None:
+            continue
+        if not worksheet.row_data_fh.closed:
+            worksheet.row_data_fh.close()
+        try:
+            os.remove(worksheet.row_data_filename)
+        except OSError:
+            pass
+    workbook.fileclosed = True
 
 
 def dump(signalDescriptionDB, filename, **options):
@@ -130,7 +320,11 @@ def dump(signalDescriptionDB, filename, **options):
     head_tail = ['Value', 'Name / Phys. Range', 'Function / Increment Unit',
                  'Signal_Group']
 
-    workbook = xlsxwriter.Workbook(filename)
+    # constant_memory flushes every row when the next one is started, get_signal_rows delivers complete rows in order
+    if options.get("xlsxConstantMemory", False):
+        workbook = xlsxwriter.Workbook(filename, {'constant_memory': True})
+    else:
+        workbook = xlsxwriter.Workbook(filename)
     # ws_name = os.path.basename(filename).replace('.xlsx', '')
     # worksheet = workbook.add_worksheet('K-Matrix ' + ws_name[0:22])
     
@@ -172,218 +366,68 @@ def dump(signalDescriptionDB, filename, **options):
     sty_sender_green_first_frame = workbook.add_format(
         {'pattern': 0x04, 'fg_color': '#C0C0C0', 'bg_color': '#CCFFCC', 'top': 1})
 
-    row_array = head_top
-    head_start = len(row_array)
-
-
-
-
-
-    for name in signalDescriptionDB:
-        db = signalDescriptionDB[name]
-        worksheet = workbook.add_worksheet(name)
-        # write ECUs in first row:
-        ecu_list = [ecu.name for ecu in db.ecus]
-        row_array += ecu_list
-
-        for col in range(0, len(row_array)):
-            worksheet.set_column(col, col, 2)
-
-        row_array += head_tail
-
-        additional_frame_start = len(row_array)
-        for additional_col in additional_frame_columns:
-            row_array.append("frame." + additional_col)
-
-        for additional_col in additional_signal_columns:
-            row_array.append("signal." + additional_col)
-        # set width of selected Cols
-        worksheet.set_column(0, 0, 10)
-        worksheet.set_column(1, 1, 30)  # column b width
-        worksheet.set_column(2, 3, 10)  # column c width
-        worksheet.set_column(3, 3, 6)   # column d width
-        worksheet.set_column(5, 5, 25)  # column F width
-        worksheet.set_column(6, 6, 15)
-        worksheet.set_column(7, 7, 5)
-        worksheet.set_column(8, 8, 12)  # column I width
-        worksheet.set_column(11, 11, 30)
-        worksheet.set_column(12, 12, 45)
-        worksheet.set_column(20, 20, 15)
-
-        write_excel_line(worksheet, 0, 0, row_array, sty_header)
-
-        frame_hash = {}
-        logger.debug("DEBUG: Length of db.frames is %d", len(db.frames))
-        for frame in db.frames:
-            if frame.is_complex_multiplexed:
-                logger.error(
-                    "Export complex multiplexers is not supported - frame %s might be uncomplete", frame.name)
-            frame_hash[int(frame.arbitration_id.id)] = frame
-
-        # set row to first Frame (row = 0 is header)
-        row = 1
-
-        # iterate over the frames
-        for idx in sorted(frame_hash.keys()):
-
-            frame = frame_hash[idx]
-            frame_style = sty_first_frame
-            pdu_hash = {}
-            for pdu in frame.pdus:
-                pdu_hash[pdu.name] = pdu
-            # sort signals:
-            sig_hash = {}
-            for sig in pdu.signals:
-                sig_hash["%02d" % int(sig.get_startbit()) + sig.name] = sig
-
-            # set style for first line with border
-            signal_style = sty_first_frame
-
-            additional_frame_info = [frame.attribute(
-                additional, default="") for additional in additional_frame_columns]
-
-            row_array = []
-            # iterate over pdus
-            for pdu_idx in sorted(pdu_hash.keys()):
-                pdu = pdu_hash[pdu_idx]
-                if len(sig_hash) == 0:
-                    row_array += canmatrix.formats.xls_common.get_frame_info(
-                        db, frame)
-                    pdu_row_array = canmatrix.formats.xls_common.get_pdu_info(
-                        db, pdu)
-
-                    #for _ in range(5, head_start):
-                        #row_array.append("")
-                    temp_col = write_excel_line(
-                        worksheet, row, 0, row_array, frame_style)
-                    temp_col = write_excel_line(
-                        worksheet, row, temp_col, pdu_row_array, frame_style)
-                    temp_col = write_ecu_matrix(
-                        ecu_list, None, frame, worksheet, row, temp_col, frame_style)
-                    row_array = ["" for _ in range(
-                        temp_col, additional_frame_start)]
-                    row_array += additional_frame_info
-                    row_array += ["" for _ in additional_signal_columns]
-
-                    write_excel_line(worksheet, row, temp_col,
-                                    row_array, frame_style)
-                    row += 1
-            # iterate over pdus
-            # for pdu_idx in sorted(pdu_hash.keys()):
-                #pdu = pdu_hash[pdu_idx]
-                # iterate over signals
-                for sig_idx in sorted(sig_hash.keys()):
-                    sig = sig_hash[sig_idx]
-
-                    # if not first Signal in Frame, set style
-                    if signal_style != sty_first_frame:
-                        signal_style = sty_norm
-
-                    # valuetable available?
-                    if len(sig.values) > 0 and not values_in_seperate_lines:
-                        value_style = signal_style
-                        # iterate over values in valuetable
-                        for val in sorted(sig.values.keys()):
-                            row_array = canmatrix.formats.xls_common.get_frame_info(
-                                db, frame)
-                            front_col = write_excel_line(
-                                worksheet, row, 0, row_array, frame_style)
-                            pdu_row_array = canmatrix.formats.xls_common.get_pdu_info(
-                                db, pdu)
-                            front_col = write_excel_line(
-                                worksheet, row, front_col, pdu_row_array, frame_style)
-                            if frame_style != sty_first_frame:
-                                worksheet.set_row(
-                                    row, None, None, {'level': 1})
-
-                            col = head_start
-                            col = write_ecu_matrix(
-                                ecu_list, sig, frame, worksheet, row, col, frame_style)
-                            logger.debug("len(sig.values) > 0,for frame info current row_array is: " + str(
-                                row_array)+"current col is: " + str(col))
-                            # write Value
-                            (frontRow, back_row) = canmatrix.formats.xls_common.get_signal(
-                                db, sig, motorola_bit_format)
-                            logger.debug("len(sig.values) > 0, current front row is: " +
-                                        str(frontRow)+"current back_row is: " + str(back_row))
-                            write_excel_line(
-                                worksheet, row, front_col, frontRow, signal_style)
-                            back_row += additional_frame_info
-                            for item in additional_signal_columns:
-                                temp = getattr(sig, item, "")
-                                back_row.append(temp)
-
-                            write_excel_line(
-                                worksheet, row, col + 2, back_row, signal_style)
-                            write_excel_line(worksheet, row, col, [
-                                val, sig.values[val]], value_style)
-
-                            # no min/max here, because min/max has same col as values...
-                            # next row
-                            row += 1
-                            # set style to normal - without border
-                            signal_style = sty_white
-                            frame_style = sty_white
-                            value_style = sty_norm
-                        # loop over values ends here
-                    # no valuetable available
-                    else:
-                        row_array = canmatrix.formats.xls_common.get_frame_info(
-                            db, frame)
-                        front_col = write_excel_line(
-                            worksheet, row, 0, row_array, frame_style)
-                        pdu_row_array = canmatrix.formats.xls_common.get_pdu_info(
-                            db, pdu)
-                        front_col = write_excel_line(
-                            worksheet, row, front_col, pdu_row_array, frame_style)
-                        if frame_style != sty_first_frame:
-                            worksheet.set_row(row, None, None, {'level': 1})
-
-                        col = head_start
-                        col = write_ecu_matrix(
-                            ecu_list, sig, frame, worksheet, row, col, frame_style)
-                        logger.debug("len(sig.values) = 0,for frame info current row_array is: " + str(
-                            row_array)+"current col is: " + str(col))
-                        (frontRow, back_row) = canmatrix.formats.xls_common.get_signal(
-                            db, sig, motorola_bit_format)
-
-                        write_excel_line(
-                            worksheet, row, front_col, frontRow, signal_style)
-
-                        if float(sig.min) != 0 or float(sig.max) != 1.0:
-                            # type: ignore
-                            back_row.insert(0, str("%g..%g" %
-                                                (sig.min, sig.max)))
-                        else:
-                            back_row.insert(0, "")
-                        back_row.insert(0, "")
-
-                        back_row += additional_frame_info
-                        for item in additional_signal_columns:
-                            temp = getattr(sig, item, "")
-                            back_row.append(temp)
-                        logger.debug("len(sig.values) = 0,current front row is: " +
-                                    str(frontRow)+"current back_row is: " + str(back_row))
-                        write_excel_line(worksheet, row, col,
-                                        back_row, signal_style)
-                        if len(sig.values) > 0:
-                            write_excel_line(worksheet, row, col, ["\n".join(
-                                ["{}: {}".format(a, b) for (a, b) in sig.values.items()])], signal_style)
-                            logger.debug(
-                                "sig.values.items() keys is : "+str(sig.values.keys()))
-                        # next row
-                        row += 1
-                        # set style to normal - without border
-                        signal_style = sty_white
-                        frame_style = sty_white
-                        # loop over signals ends here
-                    # loop over frames ends here
-
-        worksheet.autofilter(0, 0, row, len(head_top) +
-                            len(head_tail) + len(db.ecus))
-        worksheet.freeze_panes(1, 0)
-    # save file
-    workbook.close()
+    head_start = len(head_top)
+
+    # the frames of a sheet are unique by id, see get_signal_rows
+    progress = canmatrix.Progress.from_options(options)
+    progress.start("write", sum(len({int(frame.arbitration_id.id) for frame in signalDescriptionDB[name].frames})
+                                for name in signalDescriptionDB))
+
+    try:
+        for name in signalDescriptionDB:
+            db = signalDescriptionDB[name]
+            worksheet = workbook.add_worksheet(name)
+            # every sheet has its own header, head_top must not collect the ECUs of all sheets
+            row_array = list(head_top)
+            # write ECUs in first row:
+            ecu_list = [ecu.name for ecu in db.ecus]
+            row_array += ecu_list
+
+            for col in range(0, len(row_array)):
+                worksheet.set_column(col, col, 2)
+
+            row_array += head_tail
+
+            additional_frame_start = len(row_array)
+            for additional_col in additional_frame_columns:
+                row_array.append("frame." + additional_col)
+
+            for additional_col in additional_signal_columns:
+                row_array.append("signal." + additional_col)
+            # set width of selected Cols
+            worksheet.set_column(0, 0, 10)
+            worksheet.set_column(1, 1, 30)  # column b width
+            worksheet.set_column(2, 3, 10)  # column c width
+            worksheet.set_column(3, 3, 6)   # column d width
+            worksheet.set_column(5, 5, 25)  # column F width
+            worksheet.set_column(6, 6, 15)
+            worksheet.set_column(7, 7, 5)
+            worksheet.set_column(8, 8, 12)  # column I width
+            worksheet.set_column(11, 11, 30)
+            worksheet.set_column(12, 12, 45)
+            worksheet.set_column(20, 20, 15)
+
+            write_excel_line(worksheet, 0, 0, row_array, sty_header)
+
+            # set row to first Frame (row = 0 is header)
+            row = 1
+            for cells, styles, outline in get_signal_rows(
+                    db, ecu_list, head_start, additional_frame_start, additional_frame_columns,
+                    additional_signal_columns, motorola_bit_format, values_in_seperate_lines, progress):
+                if outline:
+                    worksheet.set_row(row, None, None, {'level': 1})
+                write_styled_line(worksheet, row, cells, styles)
+                row += 1
+
+            worksheet.autofilter(0, 0, row, len(head_top) +
+                                len(head_tail) + len(db.ecus))
+            worksheet.freeze_panes(1, 0)
+        # save file
+        workbook.close()
+    finally:
+        if not workbook.fileclosed:
+            # cancelled or failed while writing
+            discard_workbook(workbook)
 
 
 def read_xlsx(file, **args):
@@ -400,11 +444,13 @@ def read_xlsx(file, **args):
     header = {}
     z = zipfile.ZipFile(file)
 
-    # Get shared strings
-    strings = [el.text for e, el
-               in iterparse(z.open('xl/sharedStrings.xml'))
-               if el.tag.endswith('}t')
-               ]  # type: typing.List[str]
+    # Get shared strings, workbooks written in constant_memory mode have inline strings only
+    strings = []  # type: typing.List[str]
+    if 'xl/sharedStrings.xml' in z.namelist():
+        strings = [el.text for e, el
+                   in iterparse(z.open('xl/sharedStrings.xml'))
+                   if el.tag.endswith('}t')
+                   ]
     value = ''
 
     # Open specified worksheet
@@ -412,6 +458,8 @@ def read_xlsx(file, **args):
         # get value or index to shared strings
         if el.tag.endswith('}v'):                                   # <v>84</v>
             value = el.text
+        if el.tag.endswith('}t'):                                   # <is><t>ID</t></is>
+            value += el.text or ''
         if el.tag.endswith(
                 '}c'):                                   # <c r="A3" t="s"><v>84</v></c>
             # If value is a shared string, use value as an index
@@ -66,6 +66,7 @@ def rename_frame_with_id(source_db):  # type: (canmatrix.CanMatrix) -> None
         new_name = frameSc.name + extension
         # print(new_name)
         frameSc.name = new_name
+    source_db.invalidate_frame_index()
 
 
 def rename_frame_with_sae_acronym(source_db, target_db):  # type: (canmatrix.CanMatrix, canmatrix.CanMatrix) -> None
@@ -79,6 +80,7 @@ def rename_frame_with_sae_acronym(source_db, target_db):  # type: (canmatrix.Can
 
         new_name = source_fr.name + "__" + target_fr.name
         target_fr.name = new_name
+    target_db.invalidate_frame_index()
 
 
 def join_frame_for_manufacturer(db, files):  # type: (canmatrix.CanMatrix, typing.Sequence[str]) -> None
@@ -104,7 +106,7 @@ def join_frame_for_manufacturer(db, files):  # type: (canmatrix.CanMatrix, typin
                 for sig_s in source_fr.signals:
                     new_name = "{name}_{pgn:#04x}_{sa:03}".format(
                         name=sig_s.name, pgn=pgn, sa=sa)
-                    sig_s.name = new_name
+                    source_fr.rename_signal(sig_s, new_name)
                     to_add.append(sig_s)
                 for s in to_add:
                     target_fr.add_signal(s)